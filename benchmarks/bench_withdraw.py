@@ -0,0 +1,195 @@
+"""
+离线提币基准：各交易所适配器对接本地模拟交易所 (benchmarks/mock_exchange.py)，
+按正常流程 (预检、调度、重试、状态跟踪) 批量提币，统计吞吐、延迟和每笔提币的请求数。
+
+    python benchmarks/bench_withdraw.py                                   # 全部交易所，各200笔
+    python benchmarks/bench_withdraw.py --exchange okx --count 1000 --concurrency 20
+    python benchmarks/bench_withdraw.py --rate-limit 30 --error-rate 0.02 --json result.json
+
+MEXC 通过本地 HTTP 服务测试，其余交易所用模拟对象替换适配器中的 ccxt 交易所对象。
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_exchange import MockBehavior, MockExchangeServer, MockExchangeState, mock_ccxt_module  # noqa: E402
+
+EXCHANGES = ('mexc', 'binance', 'okx', 'bitget', 'gate')
+COIN = 'USDT'
+NETWORK = 'BSC'
+CREDENTIALS = {'api_key': 'bench-key', 'api_secret': 'bench-secret', 'password': 'bench-pass'}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """最近秩法取分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def write_addresses(path: str, count: int):
+    """生成测试地址文件"""
+    from core.addresses import ADDRESS_FIELDS
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        file.write(','.join(ADDRESS_FIELDS) + '\n')
+        for i in range(count):
+            file.write(f'0x{i + 1:040x},,,bench\n')
+
+
+async def create_adapter(exchange: str, state: MockExchangeState, settings: Dict):
+    """创建对接模拟交易所的适配器，返回 (适配器, 需在结束时关闭的模拟服务)"""
+    from exchanges import ratelimit
+    from exchanges.registry import load_adapter
+
+    # 调度器按交易所名称全局共享，每轮测试重新创建
+    ratelimit._schedulers.pop(exchange, None)
+    adapter_class = load_adapter(exchange)
+    if exchange == 'mexc':
+        server = MockExchangeServer(state)
+        await server.start()
+        adapter = adapter_class(CREDENTIALS, settings)
+        adapter.hosts = server.url
+        return adapter, server
+    # ccxt 交易所对象由共用的 ccxt 适配器基类创建
+    module = importlib.import_module('exchanges.ccxt_adapter')
+    real_ccxt = module.ccxt
+    module.ccxt = mock_ccxt_module(state)
+    try:
+        return adapter_class(CREDENTIALS, settings), None
+    finally:
+        module.ccxt = real_ccxt
+
+
+async def bench_exchange(exchange: str, args) -> Dict:
+    """对单个交易所运行一轮基准"""
+    from core.journal import WithdrawJournal, make_batch_id
+    from core.plan import WithdrawPlan
+    from main import process_withdrawals
+
+    behavior = MockBehavior(latency=args.latency / 1000, jitter=args.jitter / 1000, rate_limit=args.rate_limit,
+                            error_rate=args.error_rate, timeout_rate=args.timeout_rate,
+                            timeout_delay=args.http_timeout + 1, settle_after=args.settle_after)
+    state = MockExchangeState(behavior, coin=COIN, network=NETWORK)
+    settings = {
+        'http_timeout': args.http_timeout,
+        'withdraw_retries': args.retries,
+        'retry_base_delay': 0.05,
+        'retry_max_delay': 1,
+        'status_timeout': args.status_timeout,
+        # 模拟交易所的提币历史没有延迟，超时后无需长时间确认
+        'lookup_window': 1,
+    }
+    network = f'{COIN}-{NETWORK}' if exchange == 'okx' else NETWORK
+    withdraw_config = {'coin': COIN, 'network': network, 'amount': {'min': 1, 'max': 2}, 'timeInterval': {'min': 0, 'max': 0}}
+
+    adapter, server = await create_adapter(exchange, state, settings)
+    latencies = []
+    # 提交阶段的起止时间，吞吐不计入预检和等待提币完成的时间
+    window = []
+    withdraw = adapter.withdraw
+
+    async def timed_withdraw(**kwargs):
+        started = time.perf_counter()
+        try:
+            return await withdraw(**kwargs)
+        finally:
+            finished = time.perf_counter()
+            latencies.append(finished - started)
+            window[:] = [window[0] if window else started, finished]
+
+    adapter.withdraw = timed_withdraw
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'add.csv')
+        write_addresses(path, args.count)
+        # 与正常提币一样使用日志生成自定义ID，出错重试时才能按自定义ID确认是否已提币
+        journal = WithdrawJournal(make_batch_id(exchange, withdraw_config, path), journal_dir=workdir)
+        plan = WithdrawPlan(path, withdraw_config, journal=journal)
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = await process_withdrawals(adapter, plan, withdraw_config, args.concurrency)
+        finally:
+            elapsed = time.perf_counter() - started
+            journal.close()
+            await adapter.close()
+            if server is not None:
+                await server.stop()
+
+    requests = sum(state.requests.values())
+    submit_seconds = window[1] - window[0] if window else 0.0
+    return {
+        'exchange': exchange,
+        'withdrawals': args.count,
+        'success': stats['success'],
+        'failed': stats['failed'],
+        'seconds': round(elapsed, 3),
+        'submit_seconds': round(submit_seconds, 3),
+        'per_second': round(stats['success'] / submit_seconds, 2) if submit_seconds else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+        'requests_per_withdrawal': round(requests / args.count, 2) if args.count else 0.0,
+        'requests': dict(state.requests),
+        'injected_errors': dict(state.errors),
+    }
+
+
+async def run(args) -> List[Dict]:
+    results = []
+    for exchange in args.exchange or EXCHANGES:
+        try:
+            result = await bench_exchange(exchange, args)
+        except ImportError as e:
+            print(f"⚠️ 跳过 {exchange}: 缺少依赖 {e.name or str(e)}")
+            continue
+        except Exception as e:
+            # 单个交易所失败（如预检不通过）不影响其他交易所
+            results.append({'exchange': exchange, 'error': str(e)})
+            print(f"{exchange:<8} ❌ 失败: {str(e)}")
+            continue
+        results.append(result)
+        print(f"{exchange:<8} {result['success']:>5}/{result['withdrawals']:<5} {result['per_second']:>8.1f} "
+              f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['requests_per_withdrawal']:>8.2f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='离线提币基准 (本地模拟交易所)')
+    parser.add_argument('--exchange', action='append', choices=EXCHANGES, help='要测试的交易所，可重复，默认全部')
+    parser.add_argument('--count', type=int, default=200, help='每个交易所的提币笔数')
+    parser.add_argument('--concurrency', type=int, default=10, help='最大并发数')
+    parser.add_argument('--latency', type=float, default=50, help='模拟交易所平均延迟(毫秒)')
+    parser.add_argument('--jitter', type=float, default=20, help='延迟抖动(毫秒)')
+    parser.add_argument('--rate-limit', type=float, default=0, help='模拟交易所每秒请求上限，0为不限')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='请求返回服务端错误的比例')
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help='请求超时的比例')
+    parser.add_argument('--http-timeout', type=float, default=2, help='MEXC HTTP 超时(秒)')
+    parser.add_argument('--retries', type=int, default=3, help='提币失败的重试次数')
+    parser.add_argument('--settle-after', type=float, default=1.0, help='提币提交后多少秒变为完成')
+    parser.add_argument('--status-timeout', type=float, default=0, help='等待提币完成的时间(秒)，0为不等待')
+    parser.add_argument('--json', help='将结果写入 JSON 文件')
+    args = parser.parse_args()
+
+    print(f"🧪 每个交易所 {args.count} 笔，并发 {args.concurrency}，延迟 {args.latency:.0f}±{args.jitter:.0f} ms")
+    print(f"{'交易所':<6} {'成功/总数':<10} {'笔/秒':>7} {'p50 ms':>8} {'p99 ms':>8} {'请求/笔':>6}")
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+        print(f"📝 结果已写入 {args.json}")
+
+
+if __name__ == '__main__':
+    main()
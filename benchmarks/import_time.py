@@ -0,0 +1,76 @@
+"""
+启动耗时基准：在独立进程中导入 main，统计导入耗时并检查启动路径上没有导入重量级依赖。
+
+    python benchmarks/import_time.py               # 输出耗时和最慢的模块
+    python benchmarks/import_time.py --max-ms 300  # 超过阈值或导入了重量级依赖时返回非0
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 只能在选择交易所后才导入的模块
+HEAVY_MODULES = ('ccxt', 'aiohttp', 'yarl', 'psutil', 'requests')
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+
+
+def measure(module: str = 'main') -> dict:
+    """用 -X importtime 导入模块，返回总耗时(毫秒)、各顶层模块耗时和已导入的重量级模块"""
+    code = (f"import sys; import {module}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception(f'导入 {module} 失败:\n{result.stderr}')
+
+    # -X importtime 先输出子模块再输出父模块：缩进1为顶层模块，缩进3为其直接导入的模块
+    children, modules = [], []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if indent == 3:
+            children.append((cumulative, name))
+        elif indent == 1:
+            if name == module:
+                total_us, modules = cumulative, children
+            children = []
+    heavy = [name for name in result.stdout.strip().split(',') if name]
+    return {'total_ms': total_us / 1000, 'modules': sorted(modules, reverse=True), 'heavy': heavy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='main.py 启动耗时基准')
+    parser.add_argument('--module', default='main', help='要导入的模块，默认 main')
+    parser.add_argument('--max-ms', type=float, default=None, help='导入耗时上限(毫秒)，超过则返回非0')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数，取最小值')
+    parser.add_argument('--top', type=int, default=10, help='输出最慢的模块数')
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(1, args.repeat))]
+    best = min(runs, key=lambda run: run['total_ms'])
+
+    print(f"⏱️  导入 {args.module}: {best['total_ms']:.1f} ms (最小值，共 {len(runs)} 次)")
+    for cumulative, name in best['modules'][:args.top]:
+        print(f"   {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if best['heavy']:
+        print(f"❌ 启动时导入了重量级依赖: {', '.join(best['heavy'])}")
+        failed = True
+    if args.max_ms is not None and best['total_ms'] > args.max_ms:
+        print(f"❌ 导入耗时超过上限 {args.max_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("✅ 启动路径检查通过")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+"""
+本地模拟交易所，用于离线压测，不会访问真实交易所或动用资金。
+
+- MockExchangeServer: HTTP 服务，模拟 MEXC 的 /api/v3/time 和 /api/v3/capital/* 接口
+- MockCcxtExchange: 替代 ccxt 交易所对象，模拟 ccxt 适配器用到的币种、余额、提币和提币历史方法
+
+两者共用 MockExchangeState，可设置延迟、限频和错误注入，并统计每个接口的请求数。
+单独运行时启动 HTTP 服务:
+
+    python benchmarks/mock_exchange.py --port 8800 --latency 50 --rate-limit 20 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+
+class MockBehavior:
+    """模拟交易所的行为：延迟(秒)、每秒请求上限、错误注入比例和提币完成所需时间"""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.02, rate_limit: float = 0,
+                 error_rate: float = 0.0, timeout_rate: float = 0.0, timeout_delay: float = 3.0,
+                 settle_after: float = 1.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_delay = timeout_delay
+        self.settle_after = settle_after
+
+
+# 与 ccxt 同名的异常，适配器和错误分类按类名识别
+class NetworkError(Exception):
+    pass
+
+
+class DDoSProtection(NetworkError):
+    pass
+
+
+class RateLimitExceeded(DDoSProtection):
+    pass
+
+
+class ExchangeNotAvailable(NetworkError):
+    pass
+
+
+class RequestTimeout(NetworkError):
+    pass
+
+
+class MockExchangeState:
+    """模拟交易所的账户、提币记录和请求统计"""
+
+    def __init__(self, behavior: Optional[MockBehavior] = None, coin: str = 'USDT', network: str = 'BSC',
+                 balance: float = 1e9, fee: float = 0.1, min_amount: float = 1.0):
+        self.behavior = behavior or MockBehavior()
+        self.coin = coin
+        self.network = network
+        self.balance = balance
+        self.fee = fee
+        self.min_amount = min_amount
+        self.requests = Counter()
+        self.errors = Counter()
+        self.withdrawals: List[Dict] = []
+        self._ids = itertools.count(1)
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    async def handle(self, endpoint: str):
+        """记录一次请求并按设置模拟延迟、限频和错误"""
+        self.requests[endpoint] += 1
+        behavior = self.behavior
+        if behavior.rate_limit:
+            now = time.monotonic()
+            if now - self._window_start >= 1:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            if self._window_count > behavior.rate_limit:
+                self.errors['rate_limit'] += 1
+                raise RateLimitExceeded('429 Too Many Requests')
+        await asyncio.sleep(max(0.0, behavior.latency + random.uniform(-behavior.jitter, behavior.jitter)))
+        roll = random.random()
+        if roll < behavior.timeout_rate:
+            self.errors['timeout'] += 1
+            await asyncio.sleep(behavior.timeout_delay)
+            raise RequestTimeout('request timed out')
+        if roll < behavior.timeout_rate + behavior.error_rate:
+            self.errors['server_error'] += 1
+            raise ExchangeNotAvailable('503 Service Unavailable')
+
+    def add_withdrawal(self, address: str, amount: float, client_id: str = '') -> Dict:
+        """登记一笔提币并扣减余额"""
+        total = amount + self.fee
+        if total > self.balance:
+            raise Exception('insufficient balance')
+        self.balance -= total
+        withdrawal = {
+            'id': str(next(self._ids)),
+            'client_id': client_id or '',
+            'address': address,
+            'amount': amount,
+            'created': time.time(),
+        }
+        self.withdrawals.append(withdrawal)
+        return withdrawal
+
+    def is_settled(self, withdrawal: Dict) -> bool:
+        return time.time() - withdrawal['created'] >= self.behavior.settle_after
+
+    def history(self, since: Optional[int] = None, client_id: Optional[str] = None, limit: int = 1000,
+                until: Optional[int] = None) -> List[Dict]:
+        """按时间倒序返回 [since, until] 内最新的提币记录"""
+        records = [
+            w for w in reversed(self.withdrawals)
+            if (since is None or w['created'] * 1000 >= since) and (until is None or w['created'] * 1000 <= until)
+            and (not client_id or w['client_id'] == client_id)
+        ]
+        return records[:limit]
+
+
+class MockCcxtExchange:
+    """替代 ccxt 交易所对象，实现各适配器用到的方法"""
+
+    CLIENT_ID_KEYS = ('withdrawOrderId', 'withdraw_order_id', 'clientOid', 'clientId')
+
+    def __init__(self, state: MockExchangeState, okx_chain: str = ''):
+        self.state = state
+        # OKX 的网络名称为 "币种-链"
+        self.okx_chain = okx_chain or f'{state.coin}-{state.network}'
+
+    def _client_id(self, params: Optional[Dict]) -> str:
+        params = params or {}
+        return next((params[key] for key in self.CLIENT_ID_KEYS if params.get(key)), '')
+
+    def _unified(self, withdrawal: Dict) -> Dict:
+        return {
+            'id': withdrawal['id'],
+            'txid': f"0x{int(withdrawal['id']):064x}" if self.state.is_settled(withdrawal) else None,
+            'status': 'ok' if self.state.is_settled(withdrawal) else 'pending',
+            'amount': withdrawal['amount'],
+            'timestamp': int(withdrawal['created'] * 1000),
+            'info': {'withdrawOrderId': withdrawal['client_id']},
+        }
+
+    async def fetch_currencies(self, params=None) -> Dict:
+        await self.state.handle('currencies')
+        state = self.state
+        network = {
+            'withdraw': True,
+            'fee': state.fee,
+            'withdrawFee': state.fee,
+            'withdrawMin': state.min_amount,
+            'info': {'chain': self.okx_chain},
+        }
+        return {state.coin: {'networks': {state.network: network}}}
+
+    async def fetch_balance(self, params=None) -> Dict:
+        await self.state.handle('balance')
+        return {'free': {self.state.coin: self.state.balance}}
+
+    async def withdraw(self, code, amount, address, tag=None, params=None) -> Dict:
+        await self.state.handle('withdraw')
+        withdrawal = self.state.add_withdrawal(address, float(amount), self._client_id(params))
+        return self._unified(withdrawal)
+
+    async def fetch_withdrawals(self, code=None, since=None, limit=None, params=None) -> List[Dict]:
+        await self.state.handle('history')
+        records = self.state.history(since, self._client_id(params), limit or 1000, (params or {}).get('until'))
+        # 与 ccxt 一致按时间正序返回
+        return [self._unified(withdrawal) for withdrawal in reversed(records)]
+
+    async def privateGetAssetBalances(self, params=None) -> Dict:
+        await self.state.handle('balance')
+        return {'data': [{'ccy': self.state.coin, 'availBal': str(self.state.balance)}]}
+
+    async def privatePostAssetWithdrawal(self, params) -> Dict:
+        await self.state.handle('withdraw')
+        withdrawal = self.state.add_withdrawal(params['toAddr'], float(params['amt']), self._client_id(params))
+        return {'data': [{'wdId': withdrawal['id'], 'clientId': withdrawal['client_id']}]}
+
+    async def privateGetAssetWithdrawalHistory(self, params=None) -> Dict:
+        await self.state.handle('history')
+        params = params or {}
+        records = self.state.history(client_id=params.get('clientId'), limit=int(params.get('limit', 100)))
+        return {'data': [{
+            'wdId': w['id'],
+            'clientId': w['client_id'],
+            'txId': '',
+            'state': '2' if self.state.is_settled(w) else '0',
+            'ts': str(int(w['created'] * 1000)),
+        } for w in records]}
+
+    async def close(self):
+        pass
+
+
+def mock_ccxt_module(state: MockExchangeState) -> SimpleNamespace:
+    """可替换适配器模块中 ccxt 引用的对象：所有交易所类都返回同一个模拟交易所"""
+    def factory(config=None):
+        return MockCcxtExchange(state)
+    return SimpleNamespace(binance=factory, okx=factory, bitget=factory, gateio=factory,
+                           DDoSProtection=DDoSProtection, RateLimitExceeded=RateLimitExceeded,
+                           NetworkError=NetworkError)
+
+
+class MockExchangeServer:
+    """模拟 MEXC REST 接口的本地 HTTP 服务，签名只检查是否存在，不做校验"""
+
+    def __init__(self, state: MockExchangeState, host: str = '127.0.0.1', port: int = 0):
+        self.state = state
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    def _build_app(self):
+        from aiohttp import web
+
+        async def guarded(endpoint, request, handler, signed=True):
+            try:
+                await self.state.handle(endpoint)
+            except RateLimitExceeded:
+                return web.json_response({'code': 429, 'msg': 'Too Many Requests'}, status=429)
+            except ExchangeNotAvailable:
+                return web.json_response({'code': 503, 'msg': 'Service Unavailable'}, status=503)
+            except RequestTimeout:
+                return web.json_response({'code': 504, 'msg': 'Gateway Timeout'}, status=504)
+            if signed and ('signature' not in request.query or 'x-mexc-apikey' not in request.headers):
+                return web.json_response({'code': 700002, 'msg': 'Signature for this request is not valid.'}, status=400)
+            return web.json_response(handler(request.query))
+
+        def server_time(query):
+            return {'serverTime': int(time.time() * 1000)}
+
+        def config_getall(query):
+            state = self.state
+            return [{'coin': state.coin, 'networkList': [{
+                'network': state.network,
+                'withdrawFee': str(state.fee),
+                'withdrawMin': str(state.min_amount),
+                'withdrawEnable': True,
+            }]}]
+
+        def withdraw_apply(query):
+            try:
+                withdrawal = self.state.add_withdrawal(query['address'], float(query['amount']),
+                                                       query.get('withdrawOrderId', ''))
+            except Exception as e:
+                return {'code': 30004, 'msg': str(e)}
+            return {'id': withdrawal['id']}
+
+        def withdraw_history(query):
+            since = int(query['startTime']) if 'startTime' in query else None
+            records = self.state.history(since, limit=int(query.get('limit', 1000)))
+            return [{
+                'id': w['id'],
+                'withdrawOrderId': w['client_id'],
+                'txId': '',
+                'coin': self.state.coin,
+                'amount': str(w['amount']),
+                'status': 7 if self.state.is_settled(w) else 1,
+                'applyTime': int(w['created'] * 1000),
+            } for w in records]
+
+        def withdraw_cancel(query):
+            return {'id': query.get('id', '')}
+
+        routes = (
+            ('GET', '/api/v3/time', 'time', server_time, False),
+            ('GET', '/api/v3/capital/config/getall', 'currencies', config_getall, True),
+            ('POST', '/api/v3/capital/withdraw/apply', 'withdraw', withdraw_apply, True),
+            ('GET', '/api/v3/capital/withdraw/history', 'history', withdraw_history, True),
+            ('DELETE', '/api/v3/capital/withdraw', 'cancel', withdraw_cancel, True),
+        )
+        app = web.Application()
+        for method, path, endpoint, handler, signed in routes:
+            async def route(request, endpoint=endpoint, handler=handler, signed=signed):
+                return await guarded(endpoint, request, handler, signed)
+            app.router.add_route(method, path, route)
+        return app
+
+    async def start(self):
+        from aiohttp import web
+        self._runner = web.AppRunner(self._build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # 端口为0时使用系统分配的端口
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+async def serve(args):
+    behavior = MockBehavior(latency=args.latency / 1000, jitter=args.jitter / 1000, rate_limit=args.rate_limit,
+                            error_rate=args.error_rate, timeout_rate=args.timeout_rate)
+    server = MockExchangeServer(MockExchangeState(behavior, coin=args.coin, network=args.network),
+                                args.host, args.port)
+    await server.start()
+    print(f"🧪 模拟交易所已启动: {server.url} (Ctrl+C 退出)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地模拟交易所 (MEXC 接口)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--coin', default='USDT')
+    parser.add_argument('--network', default='BSC')
+    parser.add_argument('--latency', type=float, default=50, help='平均延迟(毫秒)')
+    parser.add_argument('--jitter', type=float, default=20, help='延迟抖动(毫秒)')
+    parser.add_argument('--rate-limit', type=float, default=0, help='每秒请求上限，超过返回429，0为不限')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='返回503的比例')
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help='超时的比例')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import csv
+import os
+from typing import Dict, Iterator, Optional, Sequence
+
+ADDRESS_FIELDS = ('add', 'memo', 'id', 'remark')
+
+
+def reject_path_for(path: str, rows: Optional[Sequence[int]] = None) -> str:
+    """地址文件对应的错误行文件，指定了行范围时按范围区分"""
+    root, _ = os.path.splitext(path)
+    if rows:
+        root = f"{root}.rows{rows[0]}-{rows[1]}"
+    return f"{root}.rejects.csv"
+
+
+def check_address_file(path: str = 'add.csv'):
+    """只读取表头，检查地址文件存在且包含 add 列"""
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        fieldnames = csv.DictReader(file).fieldnames or []
+    if 'add' not in fieldnames:
+        raise Exception(f'地址文件 {path} 缺少 add 列')
+
+
+def _validate_row(row: Dict) -> Optional[str]:
+    """检查一行地址，返回错误原因，没有错误返回 None"""
+    if None in row:
+        return '列数多于表头'
+    address = (row.get('add') or '').strip()
+    if not address:
+        return '地址为空'
+    if any(char.isspace() for char in address):
+        return '地址包含空白字符'
+    return None
+
+
+def iter_addresses(path: str = 'add.csv', rows: Optional[Sequence[int]] = None,
+                   reject_path: Optional[str] = None) -> Iterator[Dict]:
+    """
+    逐行读取地址文件并校验，内存占用与文件大小无关。rows 为 [起始行, 结束行]（从1开始，含两端）；
+    格式错误的行跳过，传入 reject_path 时连同原因写入该文件
+    """
+    check_address_file(path)
+    start, end = (int(rows[0]), int(rows[1])) if rows else (1, None)
+    rejects = None
+    reject_writer = None
+    rejected = 0
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as file:
+            for row_number, row in enumerate(csv.DictReader(file), 1):
+                if row_number < start:
+                    continue
+                if end is not None and row_number > end:
+                    break
+                reason = _validate_row(row)
+                if reason is not None:
+                    rejected += 1
+                    if reject_path is not None:
+                        if reject_writer is None:
+                            rejects = open(reject_path, 'w', encoding='utf-8', newline='')
+                            reject_writer = csv.writer(rejects)
+                            reject_writer.writerow(('row', 'reason') + ADDRESS_FIELDS)
+                        reject_writer.writerow((row_number, reason)
+                                               + tuple(row.get(field) or '' for field in ADDRESS_FIELDS))
+                    continue
+                yield {
+                    'row': row_number,
+                    'address': row['add'].strip(),
+                    'memo': (row.get('memo') or '').strip(),
+                    'id': (row.get('id') or '').strip(),
+                    'remark': (row.get('remark') or '').strip()
+                }
+    finally:
+        if rejects is not None:
+            rejects.close()
+    if rejected and reject_path is not None:
+        print(f"⚠️ {rejected} 行地址格式错误已跳过，详见 {reject_path}")
@@ -0,0 +1,110 @@
+import math
+import random
+from array import array
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Tuple
+
+# 交易所未提供精度时保留的小数位数，与各适配器原先的处理一致
+DEFAULT_DECIMALS = 5
+MAX_DECIMALS = 12
+
+
+def parse_precision(precision) -> Tuple[int, int]:
+    """
+    交易所返回的精度 -> (小数位数, 步长)，步长以 10^-小数位数 为单位。
+    整数表示小数位数（如 8），小数或字符串表示步长（如 0.0001、"0.5"），缺失时使用默认小数位数
+    """
+    if precision is None or precision == '':
+        return DEFAULT_DECIMALS, 1
+    if isinstance(precision, int) and not isinstance(precision, bool):
+        return min(max(precision, 0), MAX_DECIMALS), 1
+    try:
+        value = Decimal(str(precision)).normalize()
+    except InvalidOperation:
+        return DEFAULT_DECIMALS, 1
+    if not value.is_finite() or value <= 0:
+        return DEFAULT_DECIMALS, 1
+    # 步长的小数位数直接取自十进制表示，不经过浮点格式化，超过上限时按上限处理
+    decimals = min(max(-value.as_tuple().exponent, 0), MAX_DECIMALS)
+    return decimals, max(1, int(value.scaleb(decimals).to_integral_value()))
+
+
+class AmountPlanner:
+    """
+    按交易所的精度和最小提币量生成提币金额。金额以步长的整数倍表示，
+    生成、求和和格式化都只做整数运算，提交时不需要再按精度处理
+    """
+
+    def __init__(self, amount, precision=None, min_amount: float = 0.0):
+        self.decimals, self.step_units = parse_precision(precision)
+        self.scale = 10 ** self.decimals
+        low, high = (amount['min'], amount['max']) if isinstance(amount, dict) else (amount, amount)
+        text = f'{low}-{high}' if low != high else f'{high}'
+        # 步长大于提币数量时所有金额都会被改写，多半是把小数位数当成了步长，不按此生成
+        if self.step > float(high):
+            raise Exception(f'精度步长 {self.format(self.step)} 大于提币数量 {text}，请检查网络精度或提币数量')
+        if isinstance(amount, dict):
+            # 范围的下限不低于最小提币量；范围内没有满足最小提币量的取值时保持原范围，由预检报告
+            high = self.floor_steps(amount['max'])
+            low = self.ceil_steps(max(amount['min'], min_amount))
+            self.low, self.high = (low, high) if low <= high else (self.ceil_steps(amount['min']), high)
+        else:
+            self.low = self.high = self.floor_steps(amount)
+        if self.low > self.high:
+            raise Exception(f'提币数量 {text} 范围内没有精度步长 {self.format(self.step)} 的整数倍，请调整提币数量范围')
+
+    @property
+    def step(self) -> float:
+        return self.step_units / self.scale
+
+    def floor_steps(self, value: float) -> int:
+        """金额向下取整为步数"""
+        return math.floor(float(value) * self.scale / self.step_units + 1e-9)
+
+    def ceil_steps(self, value: float) -> int:
+        """金额向上取整为步数"""
+        return math.ceil(float(value) * self.scale / self.step_units - 1e-9)
+
+    def value(self, steps: int) -> float:
+        return steps * self.step_units / self.scale
+
+    def format(self, amount: float) -> str:
+        """按精度输出金额，不会出现科学计数法"""
+        return f'{amount:.{self.decimals}f}'
+
+    def draw(self, rng: random.Random = random) -> int:
+        """随机抽取一笔金额的步数"""
+        return self.low if self.low == self.high else rng.randint(self.low, self.high)
+
+    def batch(self, count: int, total: Optional[float] = None, rng: random.Random = random) -> array:
+        """
+        一次生成整批金额的步数。指定 total 时各笔之和恰好等于 total（按精度向下取整）：
+        先把平均值两侧的随机偏移缩放到上下限以内，再把取整后的差额分给小数部分最大的几笔
+        """
+        if total is None:
+            return array('q', (self.draw(rng) for _ in range(count)))
+        if count <= 0:
+            return array('q')
+        target = self.floor_steps(total)
+        if not self.low * count <= target <= self.high * count:
+            raise Exception(f'合计 {total} 无法分成 {count} 笔 {self.value(self.low)}-{self.value(self.high)} 的金额')
+
+        average = target / count
+        spread = min(average - self.low, self.high - average)
+        noise = [rng.random() for _ in range(count)]
+        center = sum(noise) / count
+        deviation = max(abs(value - center) for value in noise) or 1.0
+        values = [average + (value - center) * spread / deviation for value in noise]
+
+        steps = array('q', (min(max(math.floor(value), self.low), self.high) for value in values))
+        remainder = target - sum(steps)
+        # 浮点误差可能使差额为负或超出可分配的笔数，按小数部分排序后逐笔调整
+        order = sorted(range(count), key=lambda i: values[i] - steps[i], reverse=remainder > 0)
+        adjust = 1 if remainder > 0 else -1
+        for i in order:
+            if remainder == 0:
+                break
+            if self.low <= steps[i] + adjust <= self.high:
+                steps[i] += adjust
+                remainder -= adjust
+        return steps
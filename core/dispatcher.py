@@ -0,0 +1,69 @@
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from exchanges.metrics import metrics
+
+
+class WithdrawDispatcher:
+    """并发提币调度器：限制同时在途的提币数量，并保证相邻两次提交的最小间隔"""
+
+    def __init__(self, concurrency: int = 1, interval: Optional[Dict] = None, label: str = '', exchange: str = ''):
+        self.concurrency = max(1, int(concurrency))
+        self.exchange = exchange
+        self.interval = interval or {'min': 0, 'max': 0}
+        self.prefix = f"[{label}] " if label else ''
+        self._pace_lock = asyncio.Lock()
+        self._next_submit = 0.0
+
+    async def _wait_turn(self):
+        """等待到下一个允许提交的时间点，再为下一笔预约间隔"""
+        async with self._pace_lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_submit - loop.time()
+            if delay > 0:
+                print(f"⏳ {self.prefix}等待 {delay:.2f} 秒后提交下一笔...")
+                await asyncio.sleep(delay)
+            self._next_submit = loop.time() + random.uniform(
+                self.interval['min'],
+                self.interval['max']
+            )
+
+    async def run(self, items: Iterable,
+                  handler: Callable[[Any], Awaitable],
+                  on_result: Callable[[int, Any, Any, Optional[Exception]], None]):
+        """
+        并发执行 handler(item)，结果按原始顺序回调 on_result(index, item, result, error)
+        """
+        source = enumerate(items, 1)
+        finished = {}
+        next_report = 1
+
+        def report(index, item, result, error):
+            nonlocal next_report
+            finished[index] = (item, result, error)
+            # 只有前面的结果都已输出时才继续输出，保证顺序
+            while next_report in finished:
+                on_result(next_report, *finished.pop(next_report))
+                next_report += 1
+
+        async def worker():
+            for index, item in source:
+                with metrics.timer('bbot_stage_seconds', exchange=self.exchange, stage='interval_wait'):
+                    await self._wait_turn()
+                try:
+                    result = await handler(item)
+                except Exception as e:
+                    report(index, item, None, e)
+                else:
+                    report(index, item, result, None)
+
+        tasks = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # 任一 worker 出错（如读取计划出错）时取消其余 worker 并等待其退出，调用方随后会关闭日志和连接；
+            # 被取消的提交只留下意图记录，续跑时再确认
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import secrets
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+def make_batch_id(exchange: str, withdraw_config: Dict, address_file: str, rows: Optional[List] = None) -> str:
+    """同一交易所、币种、网络、地址文件和行范围得到同一个批次ID，用于续跑时找到对应日志"""
+    raw = json.dumps([exchange, withdraw_config['coin'], withdraw_config['network'],
+                      os.path.abspath(address_file), rows])
+    return f"{exchange}_{withdraw_config['coin']}_{hashlib.sha1(raw.encode('utf-8')).hexdigest()[:10]}"
+
+
+def journal_key(addr_info: Dict) -> str:
+    """日志中标识一笔提币的键：地址文件中的行号加地址"""
+    return f"{addr_info['row']}:{addr_info['address']}"
+
+
+class WithdrawJournal:
+    """
+    提币日志：每笔提币的意图(intent)、提交(submitted)、失败(failed)和最终状态(status)
+    以JSONL追加写入并立即落盘，进程中断后可据此续跑，不会重复提币
+    """
+
+    # 提交后交易所返回这些状态时视为已完成，续跑时跳过
+    DONE_STATUSES = ('ok', 'pending')
+    # 交易所返回这些状态时提币未成功，续跑时与提交失败一样重新提币
+    RETRY_STATUSES = ('failed', 'canceled')
+
+    def __init__(self, batch_id: str, journal_dir: str = 'journal', resume: bool = False):
+        self.batch_id = batch_id
+        self.path = os.path.join(journal_dir, f'{batch_id}.jsonl')
+        os.makedirs(journal_dir, exist_ok=True)
+        self.entries = {}
+        # 各地址意图记录中的提币金额，后续事件不再重复记录金额
+        self.amounts = {}
+        # 各地址被交易所判为失败或取消的次数，重新提币时据此更换自定义ID
+        self.retries = {}
+        # 每次运行的随机数，写在日志第一行，续跑时沿用；没有该行的旧日志为 None，沿用原先的自定义ID
+        self.nonce = None
+        if resume:
+            self.entries = self._load()
+        elif os.path.exists(self.path):
+            # 不续跑时保留旧日志，另起新日志
+            os.replace(self.path, os.path.join(journal_dir, f'{batch_id}.{int(time.time())}.jsonl'))
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self.nonce is None and not self.entries:
+            # 新的一次运行使用新的自定义ID，不会与之前运行的提币混淆，也不会被要求ID唯一的交易所拒绝
+            self.nonce = secrets.token_hex(4)
+            self._write({'ts': time.time(), 'event': 'header', 'nonce': self.nonce})
+
+    def _load(self) -> Dict[str, Dict]:
+        entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 崩溃时可能留下写了一半的最后一行
+                        continue
+                    if entry.get('event') == 'header':
+                        self.nonce = entry['nonce']
+                        continue
+                    entries[entry['key']] = entry
+                    self._remember(entry)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def record(self, event: str, key: str, **fields):
+        """追加一条记录并 fsync，确保写入磁盘后才继续"""
+        entry = {'ts': time.time(), 'event': event, 'key': key, **fields}
+        self._write(entry)
+        self.entries[key] = entry
+        self._remember(entry)
+
+    def _write(self, entry: Dict):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _remember(self, entry: Dict):
+        key = entry['key']
+        if 'amount' in entry:
+            self.amounts[key] = entry['amount']
+        if entry['event'] == 'status' and entry.get('status') in self.RETRY_STATUSES:
+            self.retries[key] = self.retries.get(key, 0) + 1
+
+    def client_id(self, addr_info: Dict) -> str:
+        """
+        提币使用的自定义ID：地址文件中填写了 id 则直接使用，否则由批次ID、本次运行的随机数和地址生成，
+        同一次运行（含续跑）同一地址每次都相同，可据此在交易所查询和识别重复提币。
+        交易所判为失败或取消后重新提币时加上重试次数，不与失败的那笔重复
+        """
+        retries = self.retries.get(journal_key(addr_info), 0)
+        if addr_info.get('id'):
+            return f"{addr_info['id']}r{retries}" if retries else addr_info['id']
+        raw = f"{self.batch_id}:{journal_key(addr_info)}"
+        if self.nonce is not None:
+            raw = f"{self.batch_id}:{self.nonce}:{journal_key(addr_info)}"
+        if retries:
+            raw += f':{retries}'
+        digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        # 各交易所均接受32位以内的字母数字
+        return f"bb{digest[:24]}"
+
+    async def resolve_intents(self, lookup: Optional[Callable[[str, Optional[int]], Awaitable[Optional[Dict]]]],
+                              prefix: str = ''):
+        """
+        续跑前确认只有意图没有结果的提币（提交过程中中断）：按自定义ID向交易所查询，
+        已受理的记为已提交，不存在的重新提币，无法确认的保持原状，由 filter_pending 跳过
+        """
+        if lookup is None:
+            return
+        intents = [entry for entry in self.entries.values() if entry['event'] == 'intent' and entry.get('client_id')]
+        for entry in intents:
+            try:
+                found = await lookup(entry['client_id'], int(entry['ts'] * 1000) - 60 * 1000)
+            except Exception as e:
+                print(f"⚠️ {prefix}{entry['key']} 按自定义ID查询失败: {str(e)}")
+                continue
+            if found is not None and found.get('status') in self.RETRY_STATUSES:
+                self.record('status', entry['key'], id=found['id'], status=found['status'])
+            elif found is not None:
+                self.record('submitted', entry['key'], id=found['id'], client_id=entry['client_id'])
+            else:
+                del self.entries[entry['key']]
+
+    def committed_amount(self) -> float:
+        """已提交或提交时中断（可能已提币）的金额合计，续跑时从指定的合计金额中扣除"""
+        return sum(float(self.amounts.get(key) or 0) for key, entry in self.entries.items()
+                   if self.state(entry) in ('done', 'unknown'))
+
+    def state(self, entry: Optional[Dict]) -> str:
+        """
+        日志记录对应的续跑处理：done 已完成；unknown 提交中断或交易所返回未知状态，需人工核对；
+        retry 提交失败或交易所返回失败、取消；没有记录时为 pending
+        """
+        if entry is None:
+            return 'pending'
+        if entry['event'] == 'submitted':
+            return 'done'
+        if entry['event'] == 'status':
+            if entry.get('status') in self.DONE_STATUSES:
+                return 'done'
+            return 'retry' if entry.get('status') in self.RETRY_STATUSES else 'unknown'
+        if entry['event'] == 'intent':
+            return 'unknown'
+        return 'retry'
+
+    def filter_pending(self, addresses: Iterable[Dict], prefix: str = '', report: bool = True) -> Iterator[Dict]:
+        """
+        续跑时逐个过滤地址：已提交且未失败的跳过；提交中断或状态未知、无法确认是否已提币的跳过并提示人工核对；
+        提交失败、交易所返回失败或取消的，以及未处理的重新提币。report 为 False 时不输出提示
+        """
+        done = pending = 0
+        for addr_info in addresses:
+            entry = self.entries.get(journal_key(addr_info))
+            state = self.state(entry)
+            if state == 'done':
+                done += 1
+                continue
+            if state == 'unknown':
+                if report:
+                    reason = '提交时中断' if entry['event'] == 'intent' else f"交易所返回状态 {entry.get('status')}"
+                    print(f"⚠️ {prefix}第 {addr_info['row']} 行 {addr_info['address']} {reason}，状态未知，已跳过，请人工核对")
+                continue
+            if report and entry is not None and entry['event'] == 'status':
+                print(f"🔁 {prefix}第 {addr_info['row']} 行 {addr_info['address']} 提币 {entry.get('id')} "
+                      f"状态为 {entry['status']}，重新提币")
+            pending += 1
+            yield addr_info
+
+        if report and done:
+            print(f"\n📒 {prefix}续跑: 跳过已完成 {done} 笔，剩余 {pending} 笔")
+
+    def close(self):
+        self._file.close()
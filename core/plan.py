@@ -0,0 +1,76 @@
+import random
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from core.addresses import iter_addresses, reject_path_for
+from core.amounts import AmountPlanner
+
+
+class WithdrawPlan:
+    """
+    提币计划：每次迭代都从地址文件流式读取 (地址信息, 金额)，不在内存中保存整批地址。
+    金额按交易所的精度和最小提币量生成：随机金额由本次运行的种子和行号决定；
+    指定合计金额 (withdraw_config['total']) 时先数出笔数再一次生成整批金额。预检和实际提币两次读取得到同一份金额
+    """
+
+    def __init__(self, path: str, withdraw_config: Dict, rows: Optional[Sequence[int]] = None,
+                 journal=None, label: str = ''):
+        self.path = path
+        self.withdraw_config = withdraw_config
+        self.rows = rows
+        self.journal = journal
+        self.prefix = f"[{label}] " if label else ''
+        self.seed = random.getrandbits(32)
+        self.total = withdraw_config.get('total')
+        # 交易所精度未知时按默认小数位数生成，预检时按网络信息重新设置
+        self.amounts = AmountPlanner(withdraw_config['amount'])
+        # 指定合计金额时整批金额的步数，按读取顺序排列
+        self._batch = None
+        # 第一次完整读取后得到的笔数
+        self.count = None
+
+    def use_network(self, network_info: Dict):
+        """按网络的精度和最小提币量生成金额，需在第一次读取前调用"""
+        self.amounts = AmountPlanner(self.withdraw_config['amount'], network_info.get('precision'),
+                                     float(network_info.get('min') or 0))
+        self._batch = None
+
+    def amount_for(self, addr_info: Dict) -> float:
+        """按行号生成该地址的提币金额"""
+        rng = random.Random((self.seed << 32) | addr_info['row'])
+        return self.amounts.value(self.amounts.draw(rng))
+
+    def format_amount(self, amount: float) -> str:
+        """提交给交易所的金额文本"""
+        return self.amounts.format(amount)
+
+    def _addresses(self, first: bool) -> Iterator[Dict]:
+        # 错误行和续跑跳过的提示只在第一次读取时输出
+        addresses = iter_addresses(self.path, self.rows, reject_path_for(self.path, self.rows) if first else None)
+        if self.journal is not None:
+            addresses = self.journal.filter_pending(addresses, self.prefix, report=first)
+        return addresses
+
+    def __iter__(self) -> Iterator[Tuple[Dict, float]]:
+        first = self.count is None
+        if self.total is not None and self._batch is None:
+            count = sum(1 for _ in self._addresses(first=False))
+            # 续跑时只把尚未提币的余额分给剩余地址，否则已提币的部分会被重复支付
+            committed = self.journal.committed_amount() if self.journal is not None else 0.0
+            remaining = round(float(self.total) - committed, self.amounts.decimals)
+            try:
+                self._batch = self.amounts.batch(count, remaining, random.Random(self.seed))
+            except Exception as e:
+                if not committed:
+                    raise
+                raise Exception(f'{self.prefix}合计 {self.total} 中已提币 {committed}，无法续跑: {str(e)}')
+        count = 0
+        for addr_info in self._addresses(first):
+            if self._batch is None:
+                amount = self.amount_for(addr_info)
+            elif count < len(self._batch):
+                amount = self.amounts.value(self._batch[count])
+            else:
+                raise Exception(f'地址文件 {self.path} 在提币过程中被修改')
+            count += 1
+            yield addr_info, amount
+        self.count = count
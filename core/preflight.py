@@ -0,0 +1,93 @@
+from typing import Dict, Iterable, List, Tuple
+
+from core.validators import find_validator, requires_memo
+
+
+def _format_rows(rows: List[int], total: int, limit: int = 10) -> str:
+    text = ', '.join(str(row) for row in rows[:limit])
+    return text + (f' 等 {total} 行' if total > limit else '')
+
+
+async def preflight_check(exchange_instance, plan: Iterable[Tuple[Dict, float]], withdraw_config: Dict,
+                          label: str = '') -> Dict:
+    """
+    提币前对整批计划统一检查：网络是否支持、地址格式是否符合该网络、是否低于最小提币量、总金额加手续费是否超过余额。
+    计划只遍历一次，可以是流式读取的计划。任一项不通过则抛出异常，此时尚未提交任何提币。
+    """
+    prefix = f"[{label}] " if label else ''
+    coin = withdraw_config['coin']
+    network = withdraw_config['network']
+
+    network_info = (await exchange_instance.get_coin_index()).find(coin, network)
+    if network_info is None:
+        raise Exception(f'❌ {prefix}预检未通过: {coin} 不支持网络 {network}')
+    if network_info['network'] != network:
+        # 按别名找到的网络，提币时使用交易所的网络名称
+        print(f"🌐 {prefix}网络 {network} 对应交易所的 {network_info['network']}")
+        network = withdraw_config['network'] = network_info['network']
+
+    # 金额按该网络的精度和最小提币量生成
+    use_network = getattr(plan, 'use_network', None)
+    if use_network is not None:
+        try:
+            use_network(network_info)
+        except Exception as e:
+            raise Exception(f'❌ {prefix}预检未通过: {network} 网络无法生成提币金额，{str(e)}')
+
+    fee = float(network_info.get('fee') or 0)
+    min_amount = float(network_info.get('min') or 0)
+
+    # 本地校验地址格式，避免格式错误的地址占用请求和限频额度
+    validator = find_validator(network)
+    memo_required = requires_memo(network)
+
+    errors = []
+    count = below_min_count = invalid_count = no_memo_count = 0
+    below_min, invalid, no_memo = [], [], []
+    invalid_reason = ''
+    total_amount = 0.0
+    # 各类问题只保留前几行用于提示
+    for count, (addr_info, amount) in enumerate(plan, 1):
+        total_amount += amount
+        if amount <= 0 or amount < min_amount:
+            below_min_count += 1
+            if len(below_min) < 10:
+                below_min.append(count)
+        if validator is not None:
+            reason = validator(addr_info['address'])
+            if reason is not None:
+                invalid_count += 1
+                invalid_reason = invalid_reason or reason
+                if len(invalid) < 10:
+                    invalid.append(addr_info['row'])
+        if memo_required and not addr_info['memo']:
+            no_memo_count += 1
+            if len(no_memo) < 10:
+                no_memo.append(addr_info['row'])
+    if below_min_count:
+        errors.append(f'{below_min_count} 笔金额小于最小提币量 {min_amount} {coin}，'
+                      f'第 {_format_rows(below_min, below_min_count)} 笔')
+    if invalid_count:
+        errors.append(f'{invalid_count} 个地址不符合 {network} 网络格式（{invalid_reason}），'
+                      f'地址文件第 {_format_rows(invalid, invalid_count)} 行')
+    if no_memo_count:
+        print(f"⚠️ {prefix}{no_memo_count} 个地址未填写memo，{network} 网络提币到交易所时通常需要memo，"
+              f"地址文件第 {_format_rows(no_memo, no_memo_count)} 行")
+
+    total_amount = round(total_amount, 8)
+    # 部分交易所手续费从提币金额中扣除，不需要额外预留
+    total_fee = round(fee * count, 8) if getattr(exchange_instance, 'fee_on_top', True) else 0.0
+    required = round(total_amount + total_fee, 8)
+
+    available = await exchange_instance.get_balance(coin)
+    if available is not None and required > available:
+        errors.append(f'余额不足: 需要 {required} {coin}（金额 {total_amount} + 手续费 {total_fee}），可用 {available} {coin}')
+
+    print(f"\n🧮 {prefix}预检: {count} 笔，合计 {total_amount} {coin}，手续费 {total_fee} {coin}"
+          + (f"，可用余额 {available} {coin}" if available is not None else "，未检查余额"))
+
+    if errors:
+        raise Exception(f'❌ {prefix}预检未通过，本批次未提交任何提币:\n  - ' + '\n  - '.join(errors))
+
+    print(f"✅ {prefix}预检通过")
+    return {'count': count, 'fee': fee, 'min': min_amount, 'required': required, 'available': available}
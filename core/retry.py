@@ -0,0 +1,55 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 30.0) -> float:
+    """第 attempt 次重试前的等待时间：指数退避加全随机抖动，避免并发任务同时重试"""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def is_retryable(error: BaseException) -> bool:
+    """只有标记为临时错误的异常才重试"""
+    return getattr(error, 'retryable', False)
+
+
+async def retry_async(func: Callable[..., Awaitable], *args, retries: int = 3,
+                      base_delay: float = 1.0, max_delay: float = 30.0,
+                      should_retry: Optional[Callable[[BaseException], bool]] = None,
+                      on_retry: Optional[Callable[[int, BaseException, float], None]] = None, **kwargs):
+    """
+    执行异步函数，遇到可重试的错误时按指数退避重试，最多重试 retries 次。
+    should_retry 判断是否重试，未传入时按错误类型判断；on_retry(第几次重试, 错误, 等待秒数) 用于输出提示
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            retry = should_retry(e) if should_retry is not None else is_retryable(e)
+            if not retry:
+                raise
+            # 限频错误优先使用交易所给出的等待时间
+            delay = getattr(e, 'retry_after', None) or backoff_delay(attempt, base_delay, max_delay)
+            if on_retry is not None:
+                on_retry(attempt + 1, e, delay)
+            await asyncio.sleep(delay)
+
+
+async def poll_async(func: Callable[..., Awaitable], *args, window: float = 30.0,
+                     base_delay: float = 1.0, max_delay: float = 10.0, **kwargs):
+    """
+    反复调用异步函数直到返回非 None 或超过 window 秒，间隔按指数退避逐步拉长，超时仍为 None 时返回 None。
+    用于最终一致的查询接口：刚受理的记录可能要过一段时间才能查到
+    """
+    deadline = time.monotonic() + window
+    attempt = 0
+    while True:
+        result = await func(*args, **kwargs)
+        remaining = deadline - time.monotonic()
+        if result is not None or remaining <= 0:
+            return result
+        await asyncio.sleep(min(remaining, max_delay, base_delay * 2 ** attempt))
+        attempt += 1
@@ -0,0 +1,127 @@
+import csv
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+from core.addresses import ADDRESS_FIELDS
+from exchanges.cache import CoinIndex, CoinlistStore
+
+
+def submit_rate(exchange_instance, interval: Optional[Dict] = None) -> float:
+    """交易所每秒最多提交的提币笔数：取提币接口的限频额度和提币间隔两者中较小的一个"""
+    buckets = getattr(exchange_instance, 'rate_buckets', None) or {}
+    endpoints = getattr(exchange_instance, 'endpoint_weights', None) or {}
+    bucket_name, weight = endpoints.get('withdraw', (next(iter(buckets), None), 1))
+    rate = buckets[bucket_name][0] / weight if bucket_name in buckets else 1.0
+    if interval:
+        average = (interval['min'] + interval['max']) / 2
+        if average > 0:
+            rate = min(rate, 1 / average)
+    return rate
+
+
+async def collect_route(name: str, exchange_instance, coin: str, chain: str, interval: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    读取交易所在指定链上的手续费、最小提币量、余额和提交速率。手续费和最小提币量按交易所当前数据规划，
+    币种网络信息直接向交易所获取并更新本地缓存，交易所不支持该链时返回 None
+    """
+    coins = await CoinlistStore(name, exchange_instance.get_coinlist).refresh()
+    network_info = CoinIndex(coins).find_chain(coin, chain)
+    if network_info is None:
+        return None
+    try:
+        balance = await exchange_instance.get_balance(coin)
+    except Exception as e:
+        print(f"⚠️ [{name}] 获取余额失败，按余额不限规划: {str(e)}")
+        balance = None
+    return {
+        'exchange': name,
+        'network': network_info['network'],
+        'fee': float(network_info.get('fee') or 0),
+        'min': float(network_info.get('min') or 0),
+        'balance': balance,
+        'rate': submit_rate(exchange_instance, interval),
+        'fee_on_top': getattr(exchange_instance, 'fee_on_top', True),
+    }
+
+
+class RoutePlanner:
+    """
+    把一批地址分配到多个交易所：逐个地址选择使总成本增加最少的交易所，地址列表只遍历一次。
+    成本 = 手续费 + time_value × 该地址使整批预计完成时间增加的秒数，成本相同时选预计完成最早的交易所。
+    每笔按提币数量上限预留余额；最小提币量高于提币数量下限的交易所不参与
+    """
+
+    def __init__(self, routes: List[Dict], amount, time_value: float = 0.0):
+        self.amount = amount if isinstance(amount, dict) else {'min': float(amount), 'max': float(amount)}
+        self.time_value = time_value
+        self.routes = [route for route in routes if self.amount['min'] >= route['min'] and self.amount['min'] > 0]
+        for route in self.routes:
+            route['count'] = 0
+            route['remaining'] = route['balance']
+            route['reserve'] = self.amount['max'] + (route['fee'] if route['fee_on_top'] else 0)
+        self.makespan = 0.0
+        self.unrouted = 0
+
+    def assign(self) -> Optional[Dict]:
+        """为下一个地址选择交易所，所有交易所余额都不足时返回 None"""
+        best, best_key = None, None
+        for route in self.routes:
+            if route['remaining'] is not None and route['remaining'] < route['reserve']:
+                continue
+            finish = (route['count'] + 1) / route['rate']
+            cost = route['fee'] + self.time_value * max(0.0, finish - self.makespan)
+            key = (cost, finish)
+            if best_key is None or key < best_key:
+                best, best_key = route, key
+        if best is None:
+            self.unrouted += 1
+            return None
+        best['count'] += 1
+        if best['remaining'] is not None:
+            best['remaining'] -= best['reserve']
+        self.makespan = max(self.makespan, best_key[1])
+        return best
+
+    def summary(self) -> List[Dict]:
+        """各交易所分配的笔数、手续费合计和预计提交用时(秒)"""
+        return [{
+            'exchange': route['exchange'],
+            'network': route['network'],
+            'count': route['count'],
+            'fee': route['fee'],
+            'fee_total': round(route['fee'] * route['count'], 8),
+            'seconds': route['count'] / route['rate'],
+        } for route in self.routes if route['count']]
+
+
+def write_route_plan(planner: RoutePlanner, addresses: Iterable[Dict], out_dir: str, job_defaults: Dict) -> str:
+    """
+    边读取地址边分配，每个交易所写一个地址文件，无法分配的地址写入 unrouted.csv，
+    最后生成可直接用 --job 执行的任务文件，返回任务文件路径
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    files, writers = {}, {}
+
+    def writer_for(name: str):
+        if name not in writers:
+            files[name] = open(os.path.join(out_dir, f'{name}.csv'), 'w', encoding='utf-8', newline='')
+            writers[name] = csv.writer(files[name])
+            writers[name].writerow(ADDRESS_FIELDS)
+        return writers[name]
+
+    try:
+        for addr_info in addresses:
+            route = planner.assign()
+            writer_for(route['exchange'] if route is not None else 'unrouted').writerow(
+                (addr_info['address'], addr_info['memo'], addr_info['id'], addr_info['remark']))
+    finally:
+        for file in files.values():
+            file.close()
+
+    jobs = [{**job_defaults, 'exchange': item['exchange'], 'network': item['network'],
+             'addresses': os.path.join(out_dir, f"{item['exchange']}.csv")} for item in planner.summary()]
+    job_path = os.path.join(out_dir, 'jobs.json')
+    with open(job_path, 'w', encoding='utf-8') as file:
+        json.dump({'jobs': jobs}, file, ensure_ascii=False, indent=2)
+    return job_path
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import Dict
+
+from exchanges.metrics import metrics
+
+# 与 ccxt 统一的提币状态，以下三种为终态
+FINAL_STATUSES = ('ok', 'failed', 'canceled')
+
+
+class WithdrawStatusTracker:
+    """
+    后台跟踪已提交的提币：收集提币ID，每轮用一页提币历史批量对账并逐步退避，
+    直到全部进入终态，不阻塞后续提交
+    """
+
+    def __init__(self, exchange_instance, coin: str, label: str = '',
+                 initial_delay: float = 5.0, max_delay: float = 60.0):
+        self.exchange = exchange_instance
+        self.coin = coin
+        self.prefix = f"[{label}] " if label else ''
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.records = {}
+        self.pending = {}
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = None
+        # 状态变化时的回调，参数为提币记录
+        self.on_status = None
+
+    def track(self, withdraw_id, index: int, address: str, client_id: str = '', key: str = ''):
+        """登记一笔已提交的提币，client_id 为提交时使用的自定义ID，key 为调用方用于标识该笔提币的键"""
+        record = {
+            'id': str(withdraw_id),
+            'client_id': client_id,
+            'key': key,
+            'index': index,
+            'address': address,
+            'status': 'pending',
+            'submitted_at': int(time.time() * 1000),
+        }
+        self.records[record['id']] = record
+        self.pending[record['id']] = record
+        self._idle.clear()
+        self._wakeup.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        delay = self.initial_delay
+        while True:
+            if not self.pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                delay = self.initial_delay
+            await asyncio.sleep(delay)
+            changed = await self._poll()
+            # 状态无变化时逐步拉长轮询间隔
+            delay = self.initial_delay if changed else min(delay * 2, self.max_delay)
+
+    async def _poll(self) -> bool:
+        records = list(self.pending.values())
+        if not records:
+            return False
+        # 从最早的待查询提币前1分钟开始查询，避免历史记录翻页过多
+        since = min(record['submitted_at'] for record in records) - 60 * 1000
+        try:
+            with metrics.timer('bbot_stage_seconds', exchange=getattr(self.exchange, 'name', ''), stage='status_poll'):
+                statuses = await self.exchange.get_withdraw_statuses(self.coin, records, since)
+        except Exception:
+            return False
+
+        changed = False
+        for record in records:
+            status = statuses.get(record['id'])
+            if status is None or status == record['status']:
+                continue
+            changed = True
+            record['status'] = status
+            print(f"📦 {self.prefix}第 {record['index']} 笔 {record['address']} 状态: {status}")
+            if self.on_status is not None:
+                self.on_status(record)
+            if status in FINAL_STATUSES:
+                self.pending.pop(record['id'], None)
+        if not self.pending:
+            self._idle.set()
+        return changed
+
+    async def drain(self, timeout: float) -> Dict[str, int]:
+        """等待所有提币进入终态或超时，停止跟踪并返回各状态的数量"""
+        if timeout > 0 and self.pending:
+            print(f"\n🔍 {self.prefix}等待 {len(self.pending)} 笔提币完成 (最长 {timeout:.0f} 秒)...")
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        await self.stop()
+
+        summary = {}
+        for record in self.records.values():
+            summary[record['status']] = summary.get(record['status'], 0) + 1
+        return summary
+
+    async def stop(self):
+        """停止后台查询，可重复调用"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
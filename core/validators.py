@@ -0,0 +1,186 @@
+import hashlib
+import re
+from typing import Callable, Dict, Optional
+
+from exchanges.networks import canonical_chain
+
+# ---------------- Keccak-256（以太坊使用的原始 Keccak，与 hashlib.sha3_256 的填充不同） ----------------
+
+_KECCAK_RC = (
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+)
+# 各lane的循环左移位数，按 x + 5*y 排列
+_KECCAK_ROT = (
+    0, 1, 62, 28, 27,
+    36, 44, 6, 55, 20,
+    3, 10, 43, 25, 39,
+    41, 45, 15, 21, 8,
+    18, 2, 61, 56, 14,
+)
+# rho+pi 步骤中每个lane的目标位置
+_KECCAK_PI = tuple((x + 5 * y, y + 5 * ((2 * x + 3 * y) % 5)) for y in range(5) for x in range(5))
+_MASK64 = (1 << 64) - 1
+# chi 步骤中每个lane依赖的另外两个lane
+_KECCAK_CHI = tuple((i, i - i % 5 + (i + 1) % 5, i - i % 5 + (i + 2) % 5) for i in range(25))
+
+
+def _keccak_f(state: list) -> list:
+    for rc in _KECCAK_RC:
+        c = [state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ (((c[(x + 1) % 5] << 1) | (c[(x + 1) % 5] >> 63)) & _MASK64) for x in range(5)]
+        b = [0] * 25
+        for src, dst in _KECCAK_PI:
+            lane = state[src] ^ d[src % 5]
+            rot = _KECCAK_ROT[src]
+            b[dst] = ((lane << rot) | (lane >> (64 - rot))) & _MASK64
+        state = [b[i] ^ (~b[j] & b[k]) for i, j, k in _KECCAK_CHI]
+        state[0] ^= rc
+    return state
+
+
+def _keccak256_pure(data: bytes) -> bytes:
+    rate = 136
+    pad = rate - len(data) % rate
+    data += b'\x81' if pad == 1 else b'\x01' + b'\x00' * (pad - 2) + b'\x80'
+    state = [0] * 25
+    for offset in range(0, len(data), rate):
+        for i in range(rate // 8):
+            state[i] ^= int.from_bytes(data[offset + i * 8:offset + i * 8 + 8], 'little')
+        state = _keccak_f(state)
+    return b''.join(lane.to_bytes(8, 'little') for lane in state[:4])
+
+
+try:
+    # 安装了 pycryptodome 时使用其C实现
+    from Crypto.Hash import keccak as _keccak
+
+    def keccak256(data: bytes) -> bytes:
+        """计算 Keccak-256 摘要"""
+        return _keccak.new(digest_bits=256, data=data).digest()
+except ImportError:
+    keccak256 = _keccak256_pure
+
+
+# ---------------- 编码工具 ----------------
+
+_BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+_BASE58_INDEX = {char: i for i, char in enumerate(_BASE58_ALPHABET)}
+_BECH32_ALPHABET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+_BECH32_GENERATOR = (0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3)
+
+
+def _base58_decode(text: str) -> Optional[bytes]:
+    number = 0
+    for char in text:
+        digit = _BASE58_INDEX.get(char)
+        if digit is None:
+            return None
+        number = number * 58 + digit
+    leading_zeros = len(text) - len(text.lstrip('1'))
+    return b'\x00' * leading_zeros + number.to_bytes((number.bit_length() + 7) // 8, 'big')
+
+
+def _bech32_verify(address: str, hrp: str) -> bool:
+    if address != address.lower() and address != address.upper():
+        return False
+    address = address.lower()
+    separator = address.rfind('1')
+    if address[:separator] != hrp or len(address) - separator - 1 < 7:
+        return False
+    data = [_BECH32_ALPHABET.find(char) for char in address[separator + 1:]]
+    if -1 in data:
+        return False
+    checksum = 1
+    for value in [ord(char) >> 5 for char in hrp] + [0] + [ord(char) & 31 for char in hrp] + data:
+        top = checksum >> 25
+        checksum = (checksum & 0x1ffffff) << 5 ^ value
+        for i in range(5):
+            if (top >> i) & 1:
+                checksum ^= _BECH32_GENERATOR[i]
+    return checksum == 1
+
+
+# ---------------- 各网络的地址校验，返回错误原因，格式正确返回 None ----------------
+
+_EVM_PATTERN = re.compile(r'^0x[0-9a-fA-F]{40}$')
+_EOS_PATTERN = re.compile(r'^[a-z1-5.]{1,12}$')
+
+
+def check_evm(address: str) -> Optional[str]:
+    """EVM地址：0x加40位十六进制，大小写混合时按 EIP-55 校验"""
+    if not _EVM_PATTERN.match(address):
+        return '应为0x开头的40位十六进制地址'
+    body = address[2:]
+    # 全小写或全大写的地址不带校验码
+    if body == body.lower() or body == body.upper():
+        return None
+    digest = keccak256(body.lower().encode('ascii')).hex()
+    for char, nibble in zip(body, digest):
+        if char.isalpha() and char.isupper() != (int(nibble, 16) >= 8):
+            return 'EIP-55 大小写校验失败'
+    return None
+
+
+def check_solana(address: str) -> Optional[str]:
+    """Solana地址：base58编码的32字节公钥"""
+    decoded = _base58_decode(address)
+    if decoded is None:
+        return '包含非base58字符'
+    if len(decoded) != 32:
+        return '长度不是32字节'
+    return None
+
+
+def check_tron(address: str) -> Optional[str]:
+    """波场地址：T开头的base58check，版本号0x41"""
+    decoded = _base58_decode(address)
+    if decoded is None:
+        return '包含非base58字符'
+    if len(decoded) != 25 or decoded[0] != 0x41:
+        return '应为T开头的34位地址'
+    if hashlib.sha256(hashlib.sha256(decoded[:21]).digest()).digest()[:4] != decoded[21:]:
+        return 'base58check 校验失败'
+    return None
+
+
+def check_cosmos(address: str) -> Optional[str]:
+    """Cosmos地址：cosmos1开头的bech32"""
+    if not _bech32_verify(address, 'cosmos'):
+        return '应为cosmos1开头的bech32地址'
+    return None
+
+
+def check_eos(address: str) -> Optional[str]:
+    """EOS账户名：1-12位小写字母、1-5和点"""
+    if not _EOS_PATTERN.match(address) or address.endswith('.'):
+        return '应为1-12位的EOS账户名'
+    return None
+
+
+# 统一链名（见 exchanges.networks.CHAIN_ALIASES）-> 校验函数，未登记的链不做本地校验
+VALIDATORS: Dict[str, Callable[[str], Optional[str]]] = {
+    'ETH': check_evm, 'BSC': check_evm, 'OPBNB': check_evm, 'MATIC': check_evm, 'ARBITRUM': check_evm,
+    'OPTIMISM': check_evm, 'BASE': check_evm, 'AVAXC': check_evm, 'LINEA': check_evm,
+    'SOL': check_solana,
+    'TRX': check_tron,
+    'ATOM': check_cosmos,
+    'EOS': check_eos,
+}
+
+# 充值到交易所时需要memo/tag的链
+MEMO_REQUIRED = {'ATOM', 'EOS', 'XRP', 'XLM'}
+
+
+def find_validator(network: str) -> Optional[Callable[[str], Optional[str]]]:
+    """按网络名称对应的统一链名查找地址校验函数，无法识别的网络返回 None"""
+    return VALIDATORS.get(canonical_chain(network))
+
+
+def requires_memo(network: str) -> bool:
+    """该网络充值到交易所时是否通常需要memo"""
+    return canonical_chain(network) in MEMO_REQUIRED
@@ -0,0 +1,109 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal, ROUND_DOWN
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from exchanges.cache import CoinIndex, TTLCache
+
+
+@lru_cache(maxsize=None)
+def _decimal_step(precision: int) -> Decimal:
+    return Decimal(1).scaleb(-precision)
+
+
+class ExchangeAdapter(ABC):
+    """
+    交易所适配器接口：主流程只通过这些方法访问交易所，新增交易所实现该接口并在注册表中登记即可。
+    子类构造函数为 (credentials, settings)
+    """
+
+    name = ''
+    display_name = ''
+    # 开始提币前额外输出的提示
+    notice = ''
+    # config.json 中该交易所必须填写的凭证字段
+    credential_fields = ('api_key', 'api_secret')
+    # 手续费是否需在提币金额之外额外支付
+    fee_on_top = True
+    # 交易所是否拒绝重复的自定义ID。为 True 时提交超时后查询不到即可重试，重复提交会被交易所拒绝
+    client_id_idempotent = False
+    # 提币金额最多保留的小数位数；提币计划已按网络精度生成金额，这里只截断超出的部分
+    amount_decimals = 8
+
+    @classmethod
+    def credentials_from_config(cls, config: Dict) -> Dict:
+        """从交易所配置中取出凭证，缺少字段时抛出异常"""
+        credentials = {field: config.get(field) for field in cls.credential_fields}
+        if not all(credentials.values()):
+            raise ValueError(f'{cls.display_name or cls.name} API 配置不完整')
+        return credentials
+
+    async def check_connection(self):
+        """验证API连接，默认不做检查"""
+
+    def _adjust_precision(self, amount, precision: Optional[int] = None) -> float:
+        """按小数位数向下取整，小数位数未超出时直接转换，不做 Decimal 运算"""
+        precision = self.amount_decimals if precision is None else precision
+        text = str(amount)
+        if 'e' not in text.lower() and len(text.partition('.')[2]) <= precision:
+            return float(text)
+        return float(Decimal(text).quantize(_decimal_step(precision), rounding=ROUND_DOWN))
+
+    @abstractmethod
+    async def get_coinlist(self) -> List[Dict]:
+        """获取币种列表，每项包含 coin 和 networkList"""
+
+    @abstractmethod
+    async def withdraw(self, coin: str, network: str, address: str,
+                       amount: str, memo: str = '',
+                       withdraw_order_id: str = '',
+                       remark: str = '') -> Dict:
+        """执行提币，返回 {'code': 0, 'msg': 'success', 'data': {'id': 提币ID, 'withdrawal': 原始返回}}"""
+
+    @abstractmethod
+    async def get_withdraw_statuses(self, coin: str, records: List[Dict], since: Optional[int] = None) -> Dict[str, str]:
+        """批量查询多笔提币状态，返回 {提币ID: pending/ok/failed/canceled}"""
+
+    @abstractmethod
+    async def find_withdrawal(self, coin: str, client_id: str, since: Optional[int] = None) -> Optional[Dict]:
+        """按自定义ID查询提币，返回 {'id': 提币ID, 'status': 状态}，交易所没有该笔提币时返回 None"""
+
+    async def get_withdraw_status(self, coin: str, withdraw_id: str) -> str:
+        """查询单笔提币状态，返回 pending/ok/failed/canceled"""
+        statuses = await self.get_withdraw_statuses(coin, [{'id': str(withdraw_id)}])
+        return statuses.get(str(withdraw_id), 'pending')
+
+    async def get_balance(self, coin: str) -> Optional[float]:
+        """获取可用余额，不支持查询余额的交易所返回 None"""
+        ledger = getattr(self, 'ledger', None)
+        return await ledger.available(coin) if ledger is not None else None
+
+    async def get_coin_index(self) -> CoinIndex:
+        """币种网络索引，每个适配器只构建一次，到币种信息缓存的过期时间后才重新构建"""
+        index_cache = getattr(self, '_coin_index_cache', None)
+        if index_cache is None:
+            currency_cache = getattr(self, 'currency_cache', None)
+            index_cache = self._coin_index_cache = TTLCache(self._build_coin_index,
+                                                            ttl=getattr(currency_cache, 'ttl', 300))
+        return await index_cache.get()
+
+    async def _build_coin_index(self) -> CoinIndex:
+        return CoinIndex(await self.get_coinlist())
+
+    async def get_available_coins(self) -> List[Dict]:
+        """获取所有可用币种及其网络信息"""
+        try:
+            return (await self.get_coin_index()).available_coins()
+        except Exception as e:
+            raise Exception(f"获取币种列表失败: {str(e)}")
+
+    async def get_coin_networks(self, coin: str) -> List[str]:
+        """获取指定币种的可用网络"""
+        try:
+            return (await self.get_coin_index()).networks(coin)
+        except Exception as e:
+            raise Exception(f"获取网络列表失败: {str(e)}")
+
+    @abstractmethod
+    async def close(self):
+        """关闭底层连接"""
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from exchanges.networks import canonical_chain
+
+
+class TTLCache:
+    """带过期时间的异步缓存，过期后才重新加载，并发请求只触发一次加载"""
+
+    def __init__(self, loader: Callable[[], Awaitable[Any]], ttl: float = 300):
+        self.loader = loader
+        self.ttl = ttl
+        self._value = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return self._value is not None and time.monotonic() < self._expires_at
+
+    async def get(self) -> Any:
+        """获取缓存值，过期或不存在时重新加载"""
+        if self.is_fresh():
+            return self._value
+        async with self._lock:
+            # 等锁期间可能已被其他任务刷新
+            if not self.is_fresh():
+                self.set(await self.loader())
+            return self._value
+
+    def set(self, value: Any):
+        self._value = value
+        self._expires_at = time.monotonic() + self.ttl
+
+    def invalidate(self):
+        """使缓存失效，下次获取时重新加载"""
+        self._expires_at = 0.0
+
+
+def ccxt_network_limits(network: Dict) -> Dict:
+    """ccxt 币种网络信息中的最小提币量和金额精度（小数位数或步长，取决于交易所的精度模式）"""
+    limits = (network.get('limits') or {}).get('withdraw') or {}
+    return {
+        'min': network.get('withdrawMin', limits.get('min') or 0),
+        'precision': network.get('precision'),
+    }
+
+
+def normalize_coinlist(coin_list: List[Dict]) -> List[Dict]:
+    """统一为 [{'coin', 'networkList': [{'network', 'fee', 'min', 'precision'}]}] 结构，兼容MEXC原始返回"""
+    normalized = []
+    for coin_info in coin_list:
+        networks = [
+            {
+                'network': network['network'],
+                'fee': network.get('fee', network.get('withdrawFee', 0)),
+                'min': network.get('min', network.get('withdrawMin', 0)),
+                'precision': network.get('precision', network.get('withdrawIntegerMultiple')),
+            }
+            for network in coin_info.get('networkList') or []
+            if network.get('withdrawEnable', True)
+        ]
+        if networks:
+            normalized.append({'coin': coin_info['coin'], 'networkList': networks})
+    return normalized
+
+
+class CoinIndex:
+    """
+    标准化的币种网络索引：按大写币种和网络名称 O(1) 查找。网络名称除原名外还可用去掉符号的大写形式
+    （如 "bep20(bsc)" 与 "BEP20BSC"），OKX 的 "USDT-ERC20" 形式也可只用 "-" 后的链名查找，
+    都找不到时再按统一链名查找（如 Gate 的 "ETH" 也可用 "ERC20"），同一链对应多个网络时不做链名匹配
+    """
+
+    def __init__(self, coin_list: List[Dict]):
+        self.coins: Dict[str, Dict] = {}
+        self._networks: Dict[str, Dict[str, Dict]] = {}
+        self._chains: Dict[str, Dict[str, Dict]] = {}
+        for coin_info in normalize_coinlist(coin_list):
+            coin = coin_info['coin'].upper()
+            # 同一币种重复出现时保留第一条，与原先按顺序查找的结果一致
+            if coin in self.coins:
+                continue
+            self.coins[coin] = coin_info
+            aliases, chains = {}, {}
+            for network_info in coin_info['networkList']:
+                for key in self.network_keys(network_info['network']):
+                    aliases.setdefault(key, network_info)
+                chain = canonical_chain(network_info['network'])
+                if chain is not None:
+                    # 同一币种有多个网络对应同一条链时无法确定用哪个，记为 None，按链名查找时视为不存在
+                    chains[chain] = network_info if chain not in chains else None
+            self._networks[coin] = aliases
+            self._chains[coin] = chains
+
+    @staticmethod
+    def network_keys(network: str) -> List[str]:
+        """网络名称的查找键：原名、去掉符号的大写形式，以及 "币种-链" 形式中的链名"""
+        normalized = ''.join(char for char in network.upper() if char.isalnum())
+        keys = [network, normalized]
+        if '-' in network:
+            keys.append(''.join(char for char in network.split('-', 1)[1].upper() if char.isalnum()))
+        return keys
+
+    def __contains__(self, coin: str) -> bool:
+        return coin.upper() in self.coins
+
+    def __len__(self) -> int:
+        return len(self.coins)
+
+    def networks(self, coin: str) -> List[str]:
+        """币种可提币的网络名称，按交易所返回的顺序；币种不存在时返回空列表"""
+        coin_info = self.coins.get(coin.upper())
+        return [network['network'] for network in coin_info['networkList']] if coin_info else []
+
+    def find(self, coin: str, network: str) -> Optional[Dict]:
+        """查找币种在指定网络上的 {'network', 'fee', 'min'}，不存在时返回 None"""
+        aliases = self._networks.get(coin.upper())
+        if aliases is None:
+            return None
+        for key in self.network_keys(network):
+            if key in aliases:
+                return aliases[key]
+        chain = canonical_chain(network)
+        return self.find_chain(coin, chain) if chain is not None else None
+
+    def find_chain(self, coin: str, chain: str) -> Optional[Dict]:
+        """按统一链名（见 exchanges.networks.CHAIN_ALIASES）查找币种的网络，不存在或有多个网络对应该链时返回 None"""
+        return self._chains.get(coin.upper(), {}).get(chain)
+
+    def available_coins(self) -> List[Dict]:
+        """所有可提币的币种及其网络名称"""
+        return [{'coin': coin_info['coin'], 'networks': [network['network'] for network in coin_info['networkList']]}
+                for coin_info in self.coins.values()]
+
+
+class CoinlistStore:
+    """币种网络列表的本地文件缓存：启动时直接读取，同时在后台重新获取并覆盖"""
+
+    SCHEMA_VERSION = 2
+
+    def __init__(self, name: str, loader: Callable[[], Awaitable[List[Dict]]],
+                 cache_dir: str = 'cache', max_age: float = 7 * 86400):
+        self.loader = loader
+        self.path = os.path.join(cache_dir, f'coinlist_{name}.json')
+        self.max_age = max_age
+        self.from_cache = False
+        self._refresh_task = None
+
+    def load(self) -> Optional[List[Dict]]:
+        """读取本地缓存，文件不存在、版本不符或已过期时返回 None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != self.SCHEMA_VERSION:
+            return None
+        if time.time() - data.get('timestamp', 0) > self.max_age:
+            return None
+        return data.get('coins')
+
+    def save(self, coins: List[Dict]):
+        """先写临时文件再替换，避免中途退出留下损坏的缓存"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'version': self.SCHEMA_VERSION,
+                'timestamp': time.time(),
+                'coins': coins,
+            }, file, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    async def refresh(self) -> List[Dict]:
+        """从交易所重新获取并写入本地缓存"""
+        coins = normalize_coinlist(await self.loader())
+        self.save(coins)
+        return coins
+
+    async def get(self) -> List[Dict]:
+        """优先返回本地缓存并在后台刷新，无缓存时直接从交易所获取"""
+        coins = self.load()
+        self.from_cache = coins is not None
+        if coins is None:
+            return await self.refresh()
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._revalidate())
+        return coins
+
+    async def _revalidate(self):
+        try:
+            await self.refresh()
+        except Exception:
+            # 后台刷新失败不影响本次使用，下次启动时再重试
+            pass
@@ -0,0 +1,119 @@
+import ccxt.async_support as ccxt
+from functools import partial
+from typing import Dict, List, Optional
+from exchanges.base import ExchangeAdapter
+from exchanges.cache import TTLCache, ccxt_network_limits
+from exchanges.ledger import BalanceLedger
+from exchanges.ratelimit import get_scheduler
+from exchanges.history import match_withdrawals, find_withdrawal, ccxt_withdrawal_keys, fetch_withdrawal_pages
+
+
+class CcxtExchangeAdapter(ExchangeAdapter):
+    """
+    基于 ccxt 的交易所适配器：创建 ccxt 交易所对象、统一限频调度、币种信息缓存和余额账本，
+    并用 ccxt 统一接口实现币种列表、余额和提币历史查询。子类只需给出各交易所不同的部分
+    """
+
+    # ccxt 中的交易所类名
+    ccxt_id = ''
+    # 创建 ccxt 交易所对象时的额外配置
+    ccxt_options: Dict = {}
+    # 提币和查询提币历史时自定义ID的参数名
+    client_id_param = ''
+    # 提币历史每页最多返回的条数
+    history_page_size = 100
+
+    # 限频：令牌桶为 (每秒令牌数, 容量)，接口为 (令牌桶, 权重)
+    rate_buckets: Dict = {}
+    endpoint_weights: Dict = {}
+
+    def __init__(self, credentials: Dict, settings: Optional[Dict] = None):
+        config = {
+            'apiKey': credentials['api_key'],
+            'secret': credentials['api_secret'],
+            'enableRateLimit': False,  # 由统一调度器按接口限频
+            **self.ccxt_options,
+        }
+        if credentials.get('password'):
+            config['password'] = credentials['password']
+        self.exchange = getattr(ccxt, self.ccxt_id)(config)
+        # 同一交易所的所有实例共享限频额度
+        self.scheduler = get_scheduler(self.name, self.rate_buckets, self.endpoint_weights, (ccxt.DDoSProtection,))
+        # 币种/网络信息缓存，同一批次内复用，过期后再重新获取
+        self.currency_cache = TTLCache(partial(self.scheduler.run, 'currencies', self.exchange.fetch_currencies), ttl=300)
+        # 本地余额账本，只在批次开始、超过同步间隔或出错后才请求交易所余额
+        self.settings = settings or {}
+        self.ledger = BalanceLedger(self._fetch_balances, resync_interval=self.settings.get('balance_resync', 60))
+
+    async def get_coinlist(self) -> List[Dict]:
+        """获取币种列表及其支持的网络"""
+        try:
+            currencies = await self.currency_cache.get()
+            coin_list = []
+
+            for currency_id, currency in currencies.items():
+                if 'networks' in currency and currency['networks']:
+                    networks = []
+                    for network_id, network in currency['networks'].items():
+                        if network['withdraw']:  # 只添加可提现的网络
+                            networks.append({
+                                'network': network_id,
+                                'fee': network.get('withdrawFee', 0),
+                                **ccxt_network_limits(network)
+                            })
+                    if networks:  # 只添加有可用网络的币种
+                        coin_list.append({
+                            'coin': currency_id,
+                            'networkList': networks
+                        })
+
+            return coin_list
+        except Exception as e:
+            raise Exception(f"获取币种列表失败: {str(e)}")
+
+    async def _fetch_balances(self) -> Dict[str, float]:
+        """获取全部币种的可用余额"""
+        balance = await self.scheduler.run('balance', self.exchange.fetch_balance)
+        return {coin: float(free) for coin, free in balance['free'].items() if free is not None}
+
+    async def _submit_withdrawal(self, coin: str, amount: float, address: str, memo: str, params: Dict) -> Dict:
+        """调用 ccxt 统一提币接口，状态由后台跟踪器异步查询，这里直接返回"""
+        # ccxt withdraw 方法的标准格式：withdraw(code, amount, address, tag=None, params={})
+        withdrawal = await self.scheduler.run(
+            'withdraw', self.exchange.withdraw,
+            code=coin,
+            amount=amount,
+            address=address,
+            tag=memo if memo else None,
+            params=params
+        )
+        return {
+            'code': 0,
+            'msg': 'success',
+            'data': {
+                'id': withdrawal['id'],
+                'withdrawal': withdrawal
+            }
+        }
+
+    async def get_withdraw_statuses(self, coin: str, records: List[Dict], since: Optional[int] = None) -> Dict[str, str]:
+        """用提币历史批量查询多笔提币状态，返回 {提币ID: pending/ok/failed/canceled}"""
+        # 向前翻页直到覆盖最早提交的提币
+        withdrawals = await fetch_withdrawal_pages(
+            lambda until: self.scheduler.run('history', self.exchange.fetch_withdrawals, code=coin, since=since,
+                                             limit=self.history_page_size, params={'until': until} if until else {}),
+            self.history_page_size, since)
+        return match_withdrawals(records, withdrawals, ccxt_withdrawal_keys,
+                                 lambda withdrawal: withdrawal['status'] or 'pending')
+
+    async def find_withdrawal(self, coin: str, client_id: str, since: Optional[int] = None) -> Optional[Dict]:
+        """按自定义ID查询提币，返回 {'id': 提币ID, 'status': 状态}，交易所没有该笔提币时返回 None"""
+        withdrawals = await self.scheduler.run('history', self.exchange.fetch_withdrawals, code=coin, since=since,
+                                               params={self.client_id_param: client_id})
+        return find_withdrawal(withdrawals, client_id, ccxt_withdrawal_keys,
+                               lambda withdrawal: withdrawal['id'],
+                               lambda withdrawal: withdrawal['status'] or 'pending')
+
+    async def close(self):
+        """关闭底层连接"""
+        await self.exchange.close()
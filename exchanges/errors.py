@@ -0,0 +1,80 @@
+import asyncio
+from typing import Optional
+
+
+class WithdrawError(Exception):
+    """提币错误基类，retryable 表示是否为可重试的临时错误"""
+    retryable = False
+
+
+class RateLimitExceeded(WithdrawError):
+    """交易所返回 429/418 限频错误"""
+    retryable = True
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class NetworkError(WithdrawError):
+    """超时、断连或交易所暂时不可用"""
+    retryable = True
+
+
+class InsufficientFunds(WithdrawError):
+    """余额不足"""
+
+
+class AddressNotWhitelisted(WithdrawError):
+    """提币地址不在交易所白名单中"""
+
+
+class InvalidAddress(WithdrawError):
+    """提币地址或memo格式错误"""
+
+
+# 按异常类名识别 ccxt/aiohttp 的异常，避免在此引入可选依赖
+_ERROR_CLASSES = (
+    (('RateLimitExceeded', 'DDoSProtection'), RateLimitExceeded),
+    (('InsufficientFunds',), InsufficientFunds),
+    (('InvalidAddress',), InvalidAddress),
+    (('NetworkError', 'ClientError', 'TimeoutError'), NetworkError),
+)
+
+# 交易所只返回错误信息时按关键字识别
+_ERROR_KEYWORDS = (
+    (('whitelist', 'white list', '白名单'), AddressNotWhitelisted),
+    (('insufficient', '余额不足'), InsufficientFunds),
+    (('invalid address', 'address is invalid', 'address format', '地址无效', '地址错误'), InvalidAddress),
+    (('too many requests', 'rate limit', '频繁'), RateLimitExceeded),
+)
+
+
+def classify_error(error: BaseException) -> type:
+    """判断异常对应的提币错误类型"""
+    if isinstance(error, WithdrawError):
+        return type(error)
+    message = str(error).lower()
+    # 白名单错误在部分交易所被归为地址错误，优先按信息识别
+    for keywords, error_type in _ERROR_KEYWORDS[:1]:
+        if any(keyword in message for keyword in keywords):
+            return error_type
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if isinstance(error, asyncio.TimeoutError):
+        return NetworkError
+    for class_names, error_type in _ERROR_CLASSES:
+        if names.intersection(class_names):
+            return error_type
+    for keywords, error_type in _ERROR_KEYWORDS[1:]:
+        if any(keyword in message for keyword in keywords):
+            return error_type
+    return WithdrawError
+
+
+def wrap_error(label: str, error: BaseException) -> WithdrawError:
+    """把交易所或网络异常包装为对应类型的提币错误，信息前加上 label"""
+    error_type = classify_error(error)
+    message = f"{label}: {str(error) or type(error).__name__}"
+    if error_type is RateLimitExceeded:
+        return RateLimitExceeded(message, getattr(error, 'retry_after', None))
+    return error_type(message)
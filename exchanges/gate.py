@@ -1,60 +1,24 @@
-import time
-import ccxt
-from decimal import Decimal, ROUND_DOWN
-from typing import Dict, List
+from typing import Dict
+from exchanges.ccxt_adapter import CcxtExchangeAdapter
+from exchanges.errors import wrap_error
 
-class GateWithdraw:
-    def __init__(self, credentials: Dict):
-        """初始化Gate提币类"""
-        self.exchange = ccxt.gateio({
-            'apiKey': credentials['api_key'],
-            'secret': credentials['api_secret'],
-            'enableRateLimit': True
-        })
+class GateWithdraw(CcxtExchangeAdapter):
+    name = 'gate'
+    display_name = '【Gate】芝麻交易所'
+    fee_on_top = True  # 手续费需在提币金额之外额外支付
 
-        self.network_mapping = {
-            'MATIC': 'polygon',    # Polygon/MATIC 网络
-            'ERC20': 'eth',       # ETH/ERC20 网络
-            'BEP20': 'bsc',         # BSC/BEP20 网络
-            'OPBNB': 'opbnb',       # OPBNB 网络
-            'ARBONE': 'arbevm',    # Arbitrum 网络
-            'OPTIMISM': 'opeth',    # Optimism 网络
-            'SOLANA': 'sol',      # Solana 网络
-            'BASE': 'baseevm',    # BASE 网络
-        }
+    ccxt_id = 'gateio'
+    client_id_param = 'withdraw_order_id'
+    history_page_size = 100
 
-    def _adjust_precision(self, amount: float, precision: int = 5) -> float:
-        """调整金额精度，统一使用5位小数"""
-        decimal_amount = Decimal(str(amount))
-        step = Decimal('0.' + '0' * (precision - 1) + '1')  # 0.00001 for precision=5
-        adjusted = (decimal_amount / step).quantize(Decimal('1'), rounding=ROUND_DOWN) * step
-        return float(adjusted)
-
-    def get_coinlist(self) -> List[Dict]:
-        """获取币种列表及其支持的网络"""
-        try:
-            currencies = self.exchange.fetch_currencies()
-            coin_list = []
-            
-            for currency_id, currency in currencies.items():
-                if 'networks' in currency and currency['networks']:
-                    networks = []
-                    for network_id, network in currency['networks'].items():
-                        if network['withdraw']:  # 只添加可提现的网络
-                            networks.append({
-                                'network': network_id,
-                                'fee': network.get('withdrawFee', 0),
-                                'min': network.get('withdrawMin', 0)
-                            })
-                    if networks:  # 只添加有可用网络的币种
-                        coin_list.append({
-                            'coin': currency_id,
-                            'networkList': networks
-                        })
-            
-            return coin_list
-        except Exception as e:
-            raise Exception(f"获取币种列表失败: {str(e)}")
+    # 限频：令牌桶为 (每秒令牌数, 容量)，接口为 (令牌桶, 权重)
+    rate_buckets = {'public': (20, 20), 'wallet': (20, 20), 'withdraw': (2, 2)}
+    endpoint_weights = {
+        'currencies': ('public', 1),
+        'balance': ('wallet', 1),
+        'withdraw': ('withdraw', 1),
+        'history': ('wallet', 1),
+    }
 
     async def withdraw(self, coin: str, network: str, address: str, 
                       amount: str, memo: str = '', 
@@ -64,7 +28,7 @@ class GateWithdraw:
         try:
             
             # 获取币种信息
-            currencies = self.exchange.fetch_currencies()
+            currencies = await self.currency_cache.get()
             if coin not in currencies:
                 raise Exception(f'无法获取 {coin} 的币种信息')
             
@@ -83,69 +47,22 @@ class GateWithdraw:
             min_withdraw = float(network_info.get('withdrawMin', 0))
             withdrawal_fee = float(network_info.get('withdrawFee', 0))
 
-            # 检查余额
-            balance = self.exchange.fetch_balance()
-            if coin not in balance:
-                raise Exception(f'无法获取 {coin} 余额')
-            
-            available_balance = float(balance[coin]['free'])
-            adjusted_amount = self._adjust_precision(float(amount))
+            adjusted_amount = self._adjust_precision(amount)
 
             # 检查最小提币限额
             if adjusted_amount < min_withdraw:
                 raise Exception(f'提币金额 {adjusted_amount} {coin} 小于最小提币限额 {min_withdraw} {coin}')
             
-            # 检查余额是否充足（包含手续费）
-            if adjusted_amount + withdrawal_fee > available_balance:
-                raise Exception(f'余额不足，当前可用余额: {available_balance} {coin}，需要金额: {adjusted_amount + withdrawal_fee} {coin}')
+            # 按本地账本检查余额是否充足（包含手续费）并预扣
+            await self.ledger.reserve(coin, adjusted_amount + withdrawal_fee)
 
             # 执行提币
-            withdrawal = self.exchange.withdraw(
-                code=coin,
-                amount=adjusted_amount,
-                address=address,
-                tag=memo if memo else None,
-                params={
-                    'chain': network,
-                    'withdraw_order_id': withdraw_order_id if withdraw_order_id else None,
-                    'remark': remark if remark else None
-                }
-            )
-            
-            return {
-                'code': 0,
-                'msg': 'success',
-                'data': {
-                    'withdrawal': withdrawal
-                }
-            }
+            return await self._submit_withdrawal(coin, adjusted_amount, address, memo, {
+                'chain': network,
+                self.client_id_param: withdraw_order_id if withdraw_order_id else None,
+                'remark': remark if remark else None
+            })
 
         except Exception as e:
-            raise Exception(f"Gate提币失败: {str(e)}")
-
-    def get_available_coins(self) -> List[Dict]:
-        """获取所有可用币种及其网络信息"""
-        try:
-            coin_list = self.get_coinlist()
-            available_coins = []
-            for coin_info in coin_list:
-                if 'networkList' in coin_info and coin_info.get('networkList'):
-                    available_coins.append({
-                        'coin': coin_info['coin'],
-                        'networks': [network['network'] for network in coin_info['networkList']]
-                    })
-            return available_coins
-        except Exception as e:
-            raise Exception(f"获取币种列表失败: {str(e)}")
-
-    def get_coin_networks(self, coin: str) -> List[str]:
-        """获取指定币种的可用网络"""
-        try:
-            coin_list = self.get_coinlist()
-            for coin_info in coin_list:
-                if coin_info['coin'].upper() == coin.upper():
-                    if 'networkList' in coin_info:
-                        return [network['network'] for network in coin_info['networkList']]
-            return []
-        except Exception as e:
-            raise Exception(f"获取网络列表失败: {str(e)}")
\ No newline at end of file
+            self.ledger.invalidate()
+            raise wrap_error("Gate提币失败", e)
@@ -0,0 +1,56 @@
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+
+def match_withdrawals(records: List[Dict], history: Iterable[Any],
+                      get_keys: Callable[[Any], Iterable], get_status: Callable[[Any], str]) -> Dict[str, str]:
+    """
+    用一页提币记录批量匹配待查询的提币，依次按提币ID、自定义ID(withdrawOrderId)和txid匹配。
+    返回 {提币ID: 状态}，未出现在记录中的提币不返回。
+    """
+    index = {}
+    for item in history:
+        for key in get_keys(item):
+            if key:
+                index.setdefault(str(key), item)
+
+    statuses = {}
+    for record in records:
+        for key in (record['id'], record.get('client_id'), record.get('txid')):
+            if key and str(key) in index:
+                statuses[record['id']] = get_status(index[str(key)])
+                break
+    return statuses
+
+
+def ccxt_withdrawal_keys(withdrawal: Dict) -> tuple:
+    """ccxt 统一提币结构中可用于匹配的字段"""
+    info = withdrawal.get('info') or {}
+    client_id = info.get('withdrawOrderId') or info.get('withdraw_order_id') or info.get('clientOid')
+    return withdrawal.get('id'), client_id, withdrawal.get('txid')
+
+
+def find_withdrawal(history: Iterable[Any], client_id: str, get_keys: Callable[[Any], Iterable],
+                    get_id: Callable[[Any], Any], get_status: Callable[[Any], str]) -> Optional[Dict]:
+    """在提币记录中按自定义ID查找一笔提币，返回 {'id': 提币ID, 'status': 状态}，未找到返回 None"""
+    for item in history:
+        if client_id in (str(key) for key in get_keys(item) if key):
+            return {'id': str(get_id(item)), 'status': get_status(item)}
+    return None
+
+
+async def fetch_withdrawal_pages(fetch_page: Callable[[Optional[int]], Awaitable[List[Dict]]], limit: int,
+                                 since: Optional[int] = None, max_pages: int = 10) -> List[Dict]:
+    """
+    分页读取 ccxt 提币记录：fetch_page(until) 返回截止时间 until 之前最新的一页，
+    与 OKX 相同向前翻页，直到某页不满或已覆盖 since（最早提交的提币），最多 max_pages 页
+    """
+    history = []
+    until = None
+    for _ in range(max_pages):
+        page = await fetch_page(until)
+        history.extend(page)
+        timestamps = [withdrawal['timestamp'] for withdrawal in page if withdrawal.get('timestamp')]
+        if len(page) < limit or since is None or not timestamps or min(timestamps) <= since:
+            break
+        until = min(timestamps) - 1
+    return history
@@ -0,0 +1,51 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict
+from exchanges.errors import InsufficientFunds
+
+
+class BalanceLedger:
+    """本地余额账本：批次开始时获取一次余额，提币时在本地扣减，按间隔或出错后再与交易所同步"""
+
+    def __init__(self, loader: Callable[[], Awaitable[Dict[str, float]]], resync_interval: float = 60):
+        self.loader = loader
+        self.resync_interval = resync_interval
+        self._balances = {}
+        self._synced_at = None
+        self._lock = asyncio.Lock()
+
+    def _is_stale(self) -> bool:
+        if self._synced_at is None:
+            return True
+        return self.resync_interval > 0 and time.monotonic() - self._synced_at > self.resync_interval
+
+    async def sync(self):
+        """从交易所重新获取全部可用余额"""
+        self._balances = await self.loader()
+        self._synced_at = time.monotonic()
+
+    async def available(self, coin: str) -> float:
+        """获取本地记录的可用余额"""
+        async with self._lock:
+            if self._is_stale():
+                await self.sync()
+            if coin not in self._balances:
+                raise Exception(f'无法获取 {coin} 余额')
+            return self._balances[coin]
+
+    async def reserve(self, coin: str, amount: float) -> float:
+        """检查余额并预先扣减，返回扣减前的可用余额；并发提币时保证不会超额"""
+        async with self._lock:
+            if self._is_stale():
+                await self.sync()
+            if coin not in self._balances:
+                raise Exception(f'无法获取 {coin} 余额')
+            available_balance = self._balances[coin]
+            if amount > available_balance:
+                raise InsufficientFunds(f'余额不足，当前可用余额: {available_balance} {coin}，需要金额: {amount} {coin}')
+            self._balances[coin] = available_balance - amount
+            return available_balance
+
+    def invalidate(self):
+        """标记账本失效，下次检查时重新同步"""
+        self._synced_at = None
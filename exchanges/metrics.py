@@ -0,0 +1,157 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+# 延迟直方图各桶的上限(秒)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# 指标名称 -> 说明
+METRIC_HELP = {
+    'bbot_request_seconds': '交易所接口单次请求耗时',
+    'bbot_ratelimit_wait_seconds': '请求前等待限频令牌的耗时',
+    'bbot_stage_seconds': '提币流程各阶段耗时',
+}
+
+
+class Histogram:
+    """固定桶的延迟直方图，桶的含义与 Prometheus 一致 (值 <= 上限)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """按桶内线性插值估算分位数，落在最后一个桶时返回最大值"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.max
+                lower = self.buckets[i - 1] if i else 0.0
+                return min(lower + (self.buckets[i] - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+
+class MetricsRegistry:
+    """按指标名称和标签保存直方图，可导出为 JSON 摘要或 Prometheus 文本格式"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        # 导出接口在独立线程中读取
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, **labels):
+        """记录一次耗时"""
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """统计代码块的耗时，代码块抛出异常时同样记录"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def summary(self) -> Dict[str, List[Dict]]:
+        """各指标的次数、总耗时和分位数(秒)"""
+        result = {}
+        with self._lock:
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                result.setdefault(name, []).append({
+                    'labels': dict(labels),
+                    'count': histogram.count,
+                    'sum': round(histogram.sum, 6),
+                    'avg': round(histogram.sum / histogram.count, 6) if histogram.count else 0.0,
+                    'p50': round(histogram.quantile(0.50), 6),
+                    'p90': round(histogram.quantile(0.90), 6),
+                    'p99': round(histogram.quantile(0.99), 6),
+                    'max': round(histogram.max, 6),
+                })
+        return result
+
+    def to_prometheus(self) -> str:
+        """导出为 Prometheus 文本格式"""
+        lines = []
+        with self._lock:
+            items = sorted(self._histograms.items())
+            current = None
+            for (name, labels), histogram in items:
+                if name != current:
+                    current = name
+                    lines.append(f'# HELP {name} {METRIC_HELP.get(name, name)}')
+                    lines.append(f'# TYPE {name} histogram')
+                base = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+                prefix = base + ',' if base else ''
+                cumulative = 0
+                bounds = [f'{bound:g}' for bound in histogram.buckets] + ['+Inf']
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                suffix = f'{{{base}}}' if base else ''
+                lines.append(f'{name}_sum{suffix} {histogram.sum}')
+                lines.append(f'{name}_count{suffix} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str):
+        """把摘要写入 JSON 文件"""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.summary(), file, ensure_ascii=False, indent=2)
+
+    def serve(self, port: int, host: str = '127.0.0.1'):
+        """在后台线程中提供 Prometheus 抓取接口 /metrics，返回 HTTP 服务对象。默认只监听本机"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# 全局指标，所有交易所和提币流程共用
+metrics = MetricsRegistry()
+
@@ -1,14 +1,76 @@
-import requests
+import aiohttp
+import asyncio
 import hmac
 import hashlib
+import time
 from urllib.parse import urlencode, quote
-from typing import Dict
-from decimal import Decimal, ROUND_DOWN
+from typing import Dict, List, Optional
+from yarl import URL
+from exchanges.base import ExchangeAdapter
+from exchanges.cache import TTLCache
+from exchanges.history import match_withdrawals, find_withdrawal
+from exchanges.errors import RateLimitExceeded, wrap_error
+from exchanges.metrics import metrics
+from exchanges.ratelimit import get_scheduler
 
 # ServerTime、Signature
 class TOOL(object):
-    def _get_server_time(self):
-        return requests.request('get', 'https://api.mexc.com/api/v3/time').json()['serverTime']
+    TIMESTAMP_REJECTED = 700003  # Timestamp for this request is outside of the recvWindow
+    RETRY_STATUS = (500, 502, 503, 504)
+    RATE_LIMIT_STATUS = (418, 429)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """复用长连接的会话，整个批次共享同一个连接池"""
+        if self.session is None or self.session.closed:
+            pool_size = self.settings.get('http_pool_size', 10)
+            connector = aiohttp.TCPConnector(limit=pool_size, limit_per_host=pool_size,
+                                             keepalive_timeout=60, ttl_dns_cache=300)
+            timeout = aiohttp.ClientTimeout(total=self.settings.get('http_timeout', 10), connect=5)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self.session
+
+    async def _request(self, method, url, params=None, headers=None):
+        """
+        发送请求并解析JSON。连接未建立的错误总是可以安全重试；
+        GET 请求在超时、断连或5xx时也重试，提币等非幂等请求不重试，避免重复提交
+        """
+        retries = self.settings.get('http_retries', 2)
+        idempotent = method.upper() == 'GET'
+        for attempt in range(retries + 1):
+            last_attempt = attempt >= retries
+            try:
+                async with self._get_session().request(method, url, params=params, headers=headers) as response:
+                    if response.status in self.RATE_LIMIT_STATUS:
+                        retry_after = response.headers.get('Retry-After')
+                        raise RateLimitExceeded(f'HTTP {response.status}', float(retry_after) if retry_after else None)
+                    if not (idempotent and response.status in self.RETRY_STATUS and not last_attempt):
+                        return await response.json(content_type=None)
+            except aiohttp.ClientConnectorError:
+                if last_attempt:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if not idempotent or last_attempt:
+                    raise
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def _get_server_time(self):
+        response = await self.scheduler.run('time', self._request, 'GET', '{}/api/v3/time'.format(self.hosts))
+        return response['serverTime']
+
+    async def _sync_time_offset(self):
+        """测量本地时钟与服务器时间的偏差，以请求往返的中点作为本地时间"""
+        start = time.time() * 1000
+        server_time = await self._get_server_time()
+        end = time.time() * 1000
+        self.time_offset = server_time - (start + end) / 2
+        self.time_synced_at = time.monotonic()
+
+    async def _get_timestamp(self) -> int:
+        """用本地时钟加上偏差得到服务器时间，超过同步间隔才重新测量"""
+        async with self.time_lock:
+            if self.time_synced_at is None or time.monotonic() - self.time_synced_at > self.time_sync_interval:
+                await self._sync_time_offset()
+        return int(time.time() * 1000 + self.time_offset)
 
     def _sign_v3(self, req_time, sign_params=None):
         if sign_params:
@@ -19,52 +81,88 @@ class TOOL(object):
         sign = hmac.new(self.mexc_secret.encode('utf-8'), to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
         return sign
 
-    def public_request(self, method, url, params=None):
+    async def public_request(self, method, url, params=None):
         url = '{}{}'.format(self.hosts, url)
-        return requests.request(method, url, params=params)
+        return await self._request(method, url, params=params)
 
-    def sign_request(self, method, url, params=None):
+    async def sign_request(self, method, url, params=None):
+        response = await self._send_signed(method, url, params)
+        # 时间戳被拒绝说明本地时钟发生了漂移，重新同步后重试一次
+        if isinstance(response, dict) and response.get('code') == self.TIMESTAMP_REJECTED:
+            self.time_synced_at = None
+            response = await self._send_signed(method, url, params)
+        return response
+
+    async def _send_signed(self, method, url, params=None):
         url = '{}{}'.format(self.hosts, url)
-        req_time = self._get_server_time()
-        if params:
-            params['signature'] = self._sign_v3(req_time=req_time, sign_params=params)
-        else:
-            params = {}
-            params['signature'] = self._sign_v3(req_time=req_time)
-        params['timestamp'] = req_time
+        req_time = await self._get_timestamp()
+        with metrics.timer('bbot_stage_seconds', exchange=getattr(self, 'name', ''), stage='sign'):
+            signature = self._sign_v3(req_time=req_time, sign_params=params)
+        # 按签名时的顺序拼接查询串，避免客户端重新编码导致签名不一致
+        query = "{}&timestamp={}".format(urlencode(params, quote_via=quote), req_time) if params else "timestamp={}".format(req_time)
+        query = "{}&signature={}".format(query, signature)
         headers = {
             'x-mexc-apikey': self.mexc_key,
             'Content-Type': 'application/json',
         }
-        return requests.request(method, url, params=params, headers=headers)
+        return await self._request(method, URL('{}?{}'.format(url, query), encoded=True), headers=headers)
+
+    async def close(self):
+        """关闭底层连接"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
 
 # Wallet
-class MexcWithdraw(TOOL):
-    def __init__(self, credentials: Dict):
+class MexcWithdraw(TOOL, ExchangeAdapter):
+    name = 'mexc'
+    display_name = '【MEXC】抹茶交易所'
+    fee_on_top = True  # 手续费需在提币金额之外额外支付
+    # 提币记录 status 与统一状态的对应关系，其余均视为处理中
+    withdraw_states = {7: 'ok', 8: 'failed', 9: 'canceled'}
+
+    # 限频：令牌桶为 (每秒令牌数, 容量)，接口为 (令牌桶, 权重)；MEXC 按IP每10秒500权重
+    rate_buckets = {'ip': (50, 50)}
+    endpoint_weights = {
+        'time': ('ip', 1),
+        'currencies': ('ip', 10),
+        'withdraw': ('ip', 1),
+        'history': ('ip', 1),
+        'cancel': ('ip', 1),
+    }
+
+    def __init__(self, credentials: Dict, settings: Optional[Dict] = None):
         self.api = '/api/v3/capital'
         self.hosts = 'https://api.mexc.com'
         self.mexc_key = credentials['api_key']
         self.mexc_secret = credentials['api_secret']
-        
-        # 验证API连接
+        self.settings = settings or {}
+        self.session = None
+        # 同一交易所的所有实例共享限频额度
+        self.scheduler = get_scheduler(self.name, self.rate_buckets, self.endpoint_weights)
+        # 服务器时间偏差，只在首次签名、超过同步间隔或时间戳被拒绝时重新测量
+        self.time_offset = 0.0
+        self.time_synced_at = None
+        self.time_sync_interval = self.settings.get('time_sync_interval', 300)
+        self.time_lock = asyncio.Lock()
+        # 币种/网络信息缓存，同一批次内复用，过期后再重新获取
+        self.currency_cache = TTLCache(self._fetch_coinlist, ttl=300)
+
+    async def check_connection(self):
+        """验证API连接"""
         try:
-            time = self._get_server_time()
-            print(f"\nMEXC API连接成功! 服务器时间: {time}")
+            await self._sync_time_offset()
+            print(f"\nMEXC API连接成功! 服务器时间: {int(time.time() * 1000 + self.time_offset)}")
         except Exception as e:
             raise Exception(f"MEXC API连接失败: {str(e)}")
-    def _adjust_precision(self, amount: float, precision: int = 5) -> float:
-        """调整金额精度，MEXC通常最多支持5位小数"""
-        decimal_amount = Decimal(str(amount))
-        step = Decimal('0.' + '0' * (precision - 1) + '1')  # 0.00001 for precision=5
-        adjusted = (decimal_amount / step).quantize(Decimal('1'), rounding=ROUND_DOWN) * step
-        return float(adjusted)
-
-    def get_coinlist(self):
-        """获取币种信息"""
+
+    async def _fetch_coinlist(self):
         method = 'GET'
         url = '{}{}'.format(self.api, '/config/getall')
-        response = self.sign_request(method, url)
-        return response.json()
+        return await self.scheduler.run('currencies', self.sign_request, method, url)
+
+    async def get_coinlist(self):
+        """获取币种信息"""
+        return await self.currency_cache.get()
 
     async def withdraw(self, coin: str, network: str, address: str, 
                       amount: str, memo: str = '', 
@@ -72,7 +170,7 @@ class MexcWithdraw(TOOL):
                       remark: str = '') -> Dict:
         """执行提币操作"""
         try:
-            adjusted_amount = self._adjust_precision(float(amount))
+            adjusted_amount = self._adjust_precision(amount)
 
             params = {
                 "coin": coin,
@@ -87,22 +185,52 @@ class MexcWithdraw(TOOL):
             # 执行提币
             method = 'POST'
             url = '{}{}'.format(self.api, '/withdraw/apply')
-            response = self.sign_request(method, url, params=params)
-            return response.json()
-            
+            response = await self.scheduler.run('withdraw', self.sign_request, method, url, params=params)
+            if 'id' not in response:
+                raise Exception(response.get('msg', response))
+
+            return {
+                'code': 0,
+                'msg': 'success',
+                'data': {
+                    'id': response['id'],
+                    'withdrawal': response
+                }
+            }
+
         except Exception as e:
-            raise Exception(f"MEXC提币失败: {str(e)}")
+            raise wrap_error("MEXC提币失败", e)
 
-    def get_withdraw_history(self, params=None):
+    async def get_withdraw_history(self, params=None):
         """获取提币历史"""
         method = 'GET'
         url = '{}{}'.format(self.api, '/withdraw/history')
-        response = self.sign_request(method, url, params=params)
-        return response.json()
+        return await self.scheduler.run('history', self.sign_request, method, url, params=params)
+
+    async def get_withdraw_statuses(self, coin: str, records: List[Dict], since: Optional[int] = None) -> Dict[str, str]:
+        """用一页提币历史批量查询多笔提币状态，返回 {提币ID: pending/ok/failed/canceled}"""
+        params = {'coin': coin, 'limit': 1000}
+        if since:
+            params['startTime'] = since
+        history = await self.get_withdraw_history(params)
+        return match_withdrawals(records, history,
+                                 lambda item: (item.get('id'), item.get('withdrawOrderId'), item.get('txId')),
+                                 lambda item: self.withdraw_states.get(int(item['status']), 'pending'))
+
+    async def find_withdrawal(self, coin: str, client_id: str, since: Optional[int] = None) -> Optional[Dict]:
+        """按自定义ID查询提币，返回 {'id': 提币ID, 'status': 状态}，交易所没有该笔提币时返回 None"""
+        # 提币历史不支持按 withdrawOrderId 过滤，取一页记录匹配
+        params = {'coin': coin, 'limit': 1000}
+        if since:
+            params['startTime'] = since
+        history = await self.get_withdraw_history(params)
+        return find_withdrawal(history, client_id,
+                               lambda item: (item.get('id'), item.get('withdrawOrderId')),
+                               lambda item: item['id'],
+                               lambda item: self.withdraw_states.get(int(item['status']), 'pending'))
 
-    def cancel_withdraw(self, params):
+    async def cancel_withdraw(self, params):
         """取消提币"""
         method = 'DELETE'
         url = '{}{}'.format(self.api, '/withdraw')
-        response = self.sign_request(method, url, params=params)
-        return response.json()
\ No newline at end of file
+        return await self.scheduler.run('cancel', self.sign_request, method, url, params=params)
@@ -0,0 +1,47 @@
+from typing import Optional
+
+# 跨交易所统一的链名 -> 各交易所使用的网络名称（比较时忽略大小写和符号）。
+# 包含 ccxt 统一网络代码、OKX "币种-链" 中的链名、Gate 的链ID（eth、bsc、arbevm、opeth、baseevm 等）
+# 以及 MEXC 的 "名称(代码)" 形式。只做整体匹配，"Arbitrum Nova"、"Ethereum Classic" 这类名称不会被归到相近的链
+CHAIN_ALIASES = {
+    'ETH': ('ETH', 'ERC20', 'ETHEREUM', 'ETHEREUMERC20'),
+    'BSC': ('BSC', 'BEP20', 'BEP20BSC', 'BNBSMARTCHAIN', 'BNBSMARTCHAINBEP20'),
+    'OPBNB': ('OPBNB',),
+    'TRX': ('TRX', 'TRC20', 'TRON', 'TRONTRC20'),
+    'SOL': ('SOL', 'SOLANA', 'SPL', 'SOLANASOL'),
+    'MATIC': ('MATIC', 'POLYGON', 'POL', 'POLYGONPOS', 'POLYGONMATIC'),
+    'ARBITRUM': ('ARBITRUM', 'ARBONE', 'ARBITRUMONE', 'ARBEVM', 'ARB', 'ARBITRUMONEARB'),
+    'OPTIMISM': ('OPTIMISM', 'OP', 'OPETH', 'OPTIMISMOP'),
+    'BASE': ('BASE', 'BASEEVM'),
+    'AVAXC': ('AVAXC', 'AVAXCCHAIN', 'CCHAIN'),
+    'LINEA': ('LINEA', 'LINEAETH'),
+    'ATOM': ('ATOM', 'COSMOS'),
+    'EOS': ('EOS',),
+    'XRP': ('XRP', 'RIPPLE'),
+    'XLM': ('XLM', 'STELLAR'),
+    'TON': ('TON', 'TONCOIN'),
+    'APT': ('APT', 'APTOS'),
+    'SUI': ('SUI',),
+}
+
+_ALIAS_INDEX = {alias: chain for chain, aliases in CHAIN_ALIASES.items() for alias in aliases}
+
+
+def _normalize(text: str) -> str:
+    return ''.join(char for char in text.upper() if char.isalnum())
+
+
+def canonical_chain(network: str) -> Optional[str]:
+    """
+    把交易所的网络名称转换为统一链名，无法识别时返回 None。
+    依次尝试整体名称和 "币种-链" 中的链名，都只做整体匹配
+    """
+    candidates = [network]
+    if '-' in network:
+        candidates.append(network.split('-', 1)[1])
+    for candidate in candidates:
+        chain = _ALIAS_INDEX.get(_normalize(candidate))
+        if chain is not None:
+            return chain
+    return None
+
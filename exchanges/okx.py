@@ -1,28 +1,35 @@
-import time
-import ccxt
-from typing import Dict, List
-from decimal import Decimal, ROUND_DOWN
-
-class OkxWithdraw:
-    def __init__(self, credentials: Dict):
-        """初始化OKX提币类"""
-        self.exchange = ccxt.okx({
-            'apiKey': credentials['api_key'],
-            'secret': credentials['api_secret'],
-            'password': credentials['password'],  # OKX需要密码
-            'enableRateLimit': True
-        })
-    def _adjust_precision(self, amount: float, precision: int = 5) -> float:
-        """调整金额精度，OKX通常最多支持5位小数"""
-        decimal_amount = Decimal(str(amount))
-        step = Decimal('0.' + '0' * (precision - 1) + '1')  # 0.00001 for precision=5
-        adjusted = (decimal_amount / step).quantize(Decimal('1'), rounding=ROUND_DOWN) * step
-        return float(adjusted)
-
-    def get_coinlist(self) -> List[Dict]:
+from typing import Dict, List, Optional
+from exchanges.ccxt_adapter import CcxtExchangeAdapter
+from exchanges.cache import ccxt_network_limits
+from exchanges.errors import wrap_error
+from exchanges.history import match_withdrawals, find_withdrawal
+
+class OkxWithdraw(CcxtExchangeAdapter):
+    name = 'okx'
+    display_name = '【OKX】欧易交易所'
+    notice = '请确保已添加提币地址白名单'
+    credential_fields = ('api_key', 'api_secret', 'password')
+    fee_on_top = True  # 手续费需在提币金额之外额外支付
+    # 提币记录 state 与统一状态的对应关系，其余均视为处理中
+    withdraw_states = {'-2': 'canceled', '-1': 'failed', '2': 'ok'}
+
+    # 币种列表、余额、提币和提币历史均使用 OKX 原始接口，只借用 ccxt 的签名和币种信息
+    ccxt_id = 'okx'
+    client_id_param = 'clientId'
+
+    # 限频：令牌桶为 (每秒令牌数, 容量)，接口为 (令牌桶, 权重)；OKX 各接口单独限频
+    rate_buckets = {'currencies': (6, 6), 'balance': (6, 6), 'withdraw': (6, 6), 'history': (6, 6)}
+    endpoint_weights = {
+        'currencies': ('currencies', 1),
+        'balance': ('balance', 1),
+        'withdraw': ('withdraw', 1),
+        'history': ('history', 1),
+    }
+
+    async def get_coinlist(self) -> List[Dict]:
         """获取币种列表及其支持的网络"""
         try:
-            currencies = self.exchange.fetchCurrencies()
+            currencies = await self.currency_cache.get()
             coin_list = []
             
             for currency, data in currencies.items():
@@ -32,7 +39,8 @@ class OkxWithdraw:
                         if 'info' in network and 'chain' in network['info']:
                             networks.append({
                                 'network': network['info']['chain'],
-                                'fee': network['fee']
+                                'fee': network['fee'],
+                                **ccxt_network_limits(network)
                             })
                     if networks:
                         coin_list.append({
@@ -44,6 +52,11 @@ class OkxWithdraw:
         except Exception as e:
             raise Exception(f"获取币种列表失败: {str(e)}")
 
+    async def _fetch_balances(self) -> Dict[str, float]:
+        """获取全部币种的可用余额"""
+        balance = (await self.scheduler.run('balance', self.exchange.privateGetAssetBalances))['data']
+        return {bal['ccy']: float(bal['availBal']) for bal in balance}
+
     async def withdraw(self, coin: str, network: str, address: str, 
                       amount: str, memo: str = '', 
                       withdraw_order_id: str = '', 
@@ -51,7 +64,7 @@ class OkxWithdraw:
         """执行提币操作"""
         try:
             # 获取提币费用
-            currencies = self.exchange.fetchCurrencies()
+            currencies = await self.currency_cache.get()
             withdrawal_fee = None
             for key, value in currencies[coin]['networks'].items():
                 if 'info' in value and value['info']['chain'] == network:
@@ -61,21 +74,11 @@ class OkxWithdraw:
             if not withdrawal_fee:
                 raise Exception(f'无法获取 {network} 网络的提币费用信息')
 
-            # 检查余额
-            balance = self.exchange.privateGetAssetBalances()['data']
-            available_balance = None
-            for bal in balance:
-                if bal['ccy'] == coin:
-                    available_balance = float(bal['availBal'])
-                    break
+            adjusted_amount = self._adjust_precision(amount)
 
-            if available_balance is None:
-                raise Exception(f'无法获取 {coin} 余额')
+            # 按本地账本检查余额是否充足（包含手续费）并预扣
+            await self.ledger.reserve(coin, adjusted_amount + float(withdrawal_fee))
 
-            if available_balance < (float(amount) + withdrawal_fee):
-                raise Exception(f'余额不足，当前可用余额: {available_balance} {coin}')
-            
-            adjusted_amount = self._adjust_precision(float(amount))
             # 构建提币参数
             params = {
                 'ccy': coin,
@@ -90,51 +93,50 @@ class OkxWithdraw:
             if memo:
                 params['toAddr'] = f'{address}:{memo}'
 
-            # 执行提币
-            withdrawal = self.exchange.privatePostAssetWithdrawal(params)
-            
-            # 等待5秒获取状态
-            time.sleep(5)
-            status = self.exchange.privateGetAssetDepositWithdrawStatus(
-                params={'wdId': withdrawal['data'][0]['wdId']}
-            )
+            # 自定义ID，用于按ID查询和避免重复提币
+            if withdraw_order_id:
+                params[self.client_id_param] = withdraw_order_id
+
+            # 执行提币，状态由后台跟踪器异步查询
+            withdrawal = await self.scheduler.run('withdraw', self.exchange.privatePostAssetWithdrawal, params)
 
             # 返回结果
             return {
                 'code': 0,
                 'msg': 'success',
                 'data': {
-                    'withdrawal': withdrawal['data'],
-                    'status': status['data']
+                    'id': withdrawal['data'][0]['wdId'],
+                    'withdrawal': withdrawal['data']
                 }
             }
 
         except Exception as e:
-            raise Exception(f"OKX提币失败: {str(e)}")
+            self.ledger.invalidate()
+            raise wrap_error("OKX提币失败", e)
 
-    def get_available_coins(self) -> List[Dict]:
-        """获取所有可用币种及其网络信息"""
-        try:
-            coin_list = self.get_coinlist()
-            available_coins = []
-            for coin_info in coin_list:
-                if 'networkList' in coin_info and coin_info.get('networkList'):
-                    available_coins.append({
-                        'coin': coin_info['coin'],
-                        'networks': [network['network'] for network in coin_info['networkList']]
-                    })
-            return available_coins
-        except Exception as e:
-            raise Exception(f"获取币种列表失败: {str(e)}")
+    async def get_withdraw_statuses(self, coin: str, records: List[Dict], since: Optional[int] = None) -> Dict[str, str]:
+        """用提币历史批量查询多笔提币状态，返回 {提币ID: pending/ok/failed/canceled}"""
+        params = {'ccy': coin, 'limit': '100'}
+        history = []
+        # 每页最多100条，向前翻页直到覆盖最早提交的提币
+        for _ in range(10):
+            page = (await self.scheduler.run('history', self.exchange.privateGetAssetWithdrawalHistory, params=params))['data']
+            history.extend(page)
+            if len(page) < 100 or since is None or int(page[-1]['ts']) <= since:
+                break
+            params['after'] = page[-1]['ts']
+        return match_withdrawals(records, history,
+                                 lambda item: (item.get('wdId'), item.get('clientId'), item.get('txId')),
+                                 lambda item: self.withdraw_states.get(str(item['state']), 'pending'))
 
-    def get_coin_networks(self, coin: str) -> List[str]:
-        """获取指定币种的可用网络"""
-        try:
-            coin_list = self.get_coinlist()
-            for coin_info in coin_list:
-                if coin_info['coin'].upper() == coin.upper():
-                    if 'networkList' in coin_info:
-                        return [network['network'] for network in coin_info['networkList']]
-            return []
-        except Exception as e:
-            raise Exception(f"获取网络列表失败: {str(e)}")
\ No newline at end of file
+    async def find_withdrawal(self, coin: str, client_id: str, since: Optional[int] = None) -> Optional[Dict]:
+        """按自定义ID查询提币，返回 {'id': 提币ID, 'status': 状态}，交易所没有该笔提币时返回 None"""
+        params = {'ccy': coin, self.client_id_param: client_id}
+        history = (await self.scheduler.run('history', self.exchange.privateGetAssetWithdrawalHistory, params=params))['data']
+        # 与其他交易所一致只认 since 之后的提币，不会匹配到更早的同ID提币
+        if since is not None:
+            history = [item for item in history if int(item['ts']) >= since]
+        return find_withdrawal(history, client_id,
+                               lambda item: (item.get('wdId'), item.get('clientId')),
+                               lambda item: item['wdId'],
+                               lambda item: self.withdraw_states.get(str(item['state']), 'pending'))
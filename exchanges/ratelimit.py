@@ -0,0 +1,85 @@
+import asyncio
+import time
+from typing import Dict, Tuple
+from exchanges.errors import RateLimitExceeded
+from exchanges.metrics import metrics
+
+
+class TokenBucket:
+    """令牌桶：按固定速率补充令牌，容量决定允许的突发请求量"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, weight: float = 1.0):
+        """取出指定权重的令牌，不足时等待；按先来先得的顺序排队"""
+        weight = min(weight, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                await asyncio.sleep((weight - self.tokens) / self.rate)
+
+    def penalize(self, seconds: float):
+        """被交易所限频后暂停发放令牌"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class RequestScheduler:
+    """
+    交易所请求调度器：每个接口声明所属令牌桶和权重，请求前先取令牌，
+    遇到限频错误时暂停对应令牌桶并按指数退避重试。每次请求的耗时和等待令牌的耗时按交易所和接口记录到指标中
+    """
+
+    def __init__(self, buckets: Dict[str, Tuple[float, float]], endpoints: Dict[str, Tuple[str, float]],
+                 rate_limit_errors: tuple = (RateLimitExceeded,), max_retries: int = 3, name: str = ''):
+        self.name = name
+        self.buckets = {name: TokenBucket(rate, capacity) for name, (rate, capacity) in buckets.items()}
+        self.endpoints = endpoints
+        self.default_bucket = next(iter(buckets))
+        self.rate_limit_errors = rate_limit_errors
+        self.max_retries = max_retries
+
+    async def run(self, endpoint: str, func, *args, **kwargs):
+        """按接口限频执行一次请求"""
+        bucket_name, weight = self.endpoints.get(endpoint, (self.default_bucket, 1))
+        bucket = self.buckets[bucket_name]
+        backoff = 1.0
+        for attempt in range(self.max_retries + 1):
+            with metrics.timer('bbot_ratelimit_wait_seconds', exchange=self.name, endpoint=endpoint):
+                await bucket.acquire(weight)
+            try:
+                with metrics.timer('bbot_request_seconds', exchange=self.name, endpoint=endpoint):
+                    return await func(*args, **kwargs)
+            except self.rate_limit_errors as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = getattr(e, 'retry_after', None) or backoff
+                print(f"⚠️ 触发交易所限频 ({endpoint})，{delay:.1f} 秒后重试")
+                bucket.penalize(delay)
+                backoff = min(backoff * 2, 60)
+
+
+# 同一交易所的多个实例共享一个调度器，共用交易所的限频额度
+_schedulers = {}
+
+
+def get_scheduler(name: str, buckets: Dict[str, Tuple[float, float]], endpoints: Dict[str, Tuple[str, float]],
+                  rate_limit_errors: tuple = (RateLimitExceeded,)) -> RequestScheduler:
+    """获取指定交易所共享的调度器，不存在时创建"""
+    if name not in _schedulers:
+        _schedulers[name] = RequestScheduler(buckets, endpoints, rate_limit_errors, name=name)
+    return _schedulers[name]
@@ -0,0 +1,53 @@
+import importlib
+from typing import Dict, Optional
+
+from exchanges.base import ExchangeAdapter
+
+# 内置交易所：名称 -> (适配器 "模块:类名", 菜单显示名)。适配器依赖 ccxt/aiohttp，导入耗时较长，只在选择该交易所时才导入
+BUILTIN_ADAPTERS = {
+    'mexc': ('exchanges.mexc:MexcWithdraw', 'MEXC    - 抹茶'),
+    'binance': ('exchanges.binance:BinanceWithdraw', 'Binance - 币安'),
+    'okx': ('exchanges.okx:OkxWithdraw', 'OKX     - 欧易'),
+    'bitget': ('exchanges.bitget:BitgetWithdraw', 'Bitget  - 比特'),
+    'gate': ('exchanges.gate:GateWithdraw', 'Gate    - 芝麻'),
+}
+
+# 第三方包通过该 entry point 分组登记适配器，如 myexchange = "my_package.adapter:MyWithdraw"
+ENTRY_POINT_GROUP = 'bbot.exchanges'
+
+
+def _entry_points() -> list:
+    from importlib.metadata import entry_points
+    points = entry_points()
+    if hasattr(points, 'select'):
+        return list(points.select(group=ENTRY_POINT_GROUP))
+    return list(points.get(ENTRY_POINT_GROUP, []))
+
+
+def discover_adapters(config: Optional[Dict] = None) -> Dict[str, Dict]:
+    """
+    所有可用的交易所：内置适配器、entry points 登记的适配器和 config.json 中 adapters 字段
+    （{"名称": "模块:类名"}）登记的适配器，后者覆盖前者。返回 {名称: {'path', 'label'}}，此时不导入适配器
+    """
+    adapters = {name: {'path': path, 'label': label} for name, (path, label) in BUILTIN_ADAPTERS.items()}
+    try:
+        for entry_point in _entry_points():
+            adapters[entry_point.name.lower()] = {'path': entry_point.value, 'label': entry_point.name}
+    except Exception as e:
+        print(f'⚠️ 读取交易所插件失败: {str(e)}')
+    for name, path in ((config or {}).get('adapters') or {}).items():
+        adapters[name.lower()] = {'path': path, 'label': name}
+    return adapters
+
+
+def load_adapter(name: str, config: Optional[Dict] = None) -> type:
+    """导入并返回交易所适配器类"""
+    adapters = discover_adapters(config)
+    if name not in adapters:
+        raise ValueError(f'不支持的交易所: {name}')
+    path = adapters[name]['path']
+    module_name, _, class_name = path.partition(':')
+    adapter = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(adapter, type) and issubclass(adapter, ExchangeAdapter)):
+        raise TypeError(f'{path} 不是 ExchangeAdapter 的子类')
+    return adapter
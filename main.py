@@ -1,37 +1,26 @@
+import argparse
 import asyncio
 import json
-import random
-import csv
-from typing import List, Dict, Optional
-from exchanges.mexc import MexcWithdraw
-from exchanges.binance import BinanceWithdraw
-from exchanges.okx import OkxWithdraw
-from exchanges.bitget import BitgetWithdraw
-from exchanges.gate import GateWithdraw
-import platform
-import psutil
-from datetime import datetime
+import os
+import sys
+import unicodedata
+from functools import partial
+from typing import List, Dict
+from exchanges.cache import CoinIndex, CoinlistStore
+from exchanges.registry import discover_adapters, load_adapter
+from core.dispatcher import WithdrawDispatcher
+from core.preflight import preflight_check
+from core.tracker import WithdrawStatusTracker
+from core.journal import WithdrawJournal, journal_key, make_batch_id
+from core.addresses import check_address_file, iter_addresses, reject_path_for
+from core.plan import WithdrawPlan
+from core.retry import is_retryable, poll_async, retry_async
+from core.routing import RoutePlanner, collect_route, write_route_plan
+from exchanges.errors import NetworkError, RateLimitExceeded
+from exchanges.metrics import metrics
+from exchanges.networks import canonical_chain
 import time
 
-def load_addresses() -> List[Dict]:
-    """从CSV文件加载地址和参数"""
-    try:
-        addresses = []
-        with open('add.csv', 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                addresses.append({
-                    'address': row['add'].strip(),
-                    'memo': row.get('memo', '').strip(),
-                    'id': row.get('id', '').strip(),
-                    'remark': row.get('remark', '').strip()
-                })
-        print(f'成功加载 {len(addresses)} 个地址')
-        return addresses
-    except Exception as e:
-        print(f'加载地址文件失败: {str(e)}')
-        exit(1)
-
 def load_config() -> Dict:
     """加载配置文件"""
     try:
@@ -41,6 +30,20 @@ def load_config() -> Dict:
         print(f'加载配置文件失败: {str(e)}')
         exit(1)
 
+def parse_range(value) -> Dict:
+    """解析范围参数，支持 '1-10'、'5'、数字或 {'min': 1, 'max': 10}"""
+    if isinstance(value, dict):
+        return {'min': float(value['min']), 'max': float(value['max'])}
+    if isinstance(value, str) and '-' in value:
+        min_value, max_value = map(float, value.split('-'))
+        return {'min': min_value, 'max': max_value}
+    value = float(value)
+    return {'min': value, 'max': value}
+
+async def ainput(prompt: str) -> str:
+    """在线程中等待输入，避免阻塞事件循环中的后台任务"""
+    return await asyncio.to_thread(input, prompt)
+
 async def get_withdraw_config(exchange_instance) -> Dict:
     """获取提币通用配置"""
     print("\n" + "─" * 40)
@@ -49,18 +52,17 @@ async def get_withdraw_config(exchange_instance) -> Dict:
     
     config = {}
 
-    # 输入币种
-    config['coin'] = input("\n💱 请输入币种 (例如: ETH): ").upper()
+    # 输入币种的同时加载网络列表，优先使用本地缓存并在后台刷新
+    store = CoinlistStore(exchange_instance.name, exchange_instance.get_coinlist)
+    coin_list_task = asyncio.create_task(store.get())
+    config['coin'] = (await ainput("\n💱 请输入币种 (例如: ETH): ")).upper()
     
     # 获取并显示该币种支持的网络
     try:
-        coin_list = exchange_instance.get_coinlist()
-        networks = []
-        for coin_info in coin_list:
-            if coin_info['coin'].upper() == config['coin']:
-                if 'networkList' in coin_info:
-                    networks = [network['network'] for network in coin_info['networkList']]
-                break
+        networks = CoinIndex(await coin_list_task).networks(config['coin'])
+        if not networks and store.from_cache:
+            # 本地缓存中没有该币种，可能是新上线的币，重新获取一次
+            networks = CoinIndex(await store.refresh()).networks(config['coin'])
         
         if networks:
             print(f"\n🌐 {config['coin']} 支持的网络:")
@@ -70,7 +72,7 @@ async def get_withdraw_config(exchange_instance) -> Dict:
             # 输入网络选择
             while True:
                 try:
-                    choice = int(input("\n🔢 请选择网络编号: "))
+                    choice = int(await ainput("\n🔢 请选择网络编号: "))
                     if 1 <= choice <= len(networks):
                         config['network'] = networks[choice-1]
                         break
@@ -85,130 +87,332 @@ async def get_withdraw_config(exchange_instance) -> Dict:
         raise Exception(f"❌ 获取网络信息失败: {str(e)}")
     
     # 金额设置
-    amount_input = input("\n💰 请输入提币数量 (可以输入范围/也可固定，如: 1-10/1): ")
+    amount_input = await ainput("\n💰 请输入提币数量 (可以输入范围/也可固定，如: 1-10/1): ")
     if '-' in amount_input:
-        min_amount, max_amount = map(float, amount_input.split('-'))
-        config['amount'] = {'min': min_amount, 'max': max_amount}
+        config['amount'] = parse_range(amount_input)
+        total_input = await ainput("🧮 请输入合计金额，各笔之和将等于该值 (可选，直接回车跳过): ")
+        if total_input.strip():
+            config['total'] = float(total_input)
     else:
         config['amount'] = float(amount_input)
 
     # 时间间隔设置
-    interval_input = input("⏱️  请输入间隔时间(秒) (可以输入范围/也可固定，如: 30-90/100): ")
-    if '-' in interval_input:
-        min_interval, max_interval = map(float, interval_input.split('-'))
-        config['timeInterval'] = {'min': min_interval, 'max': max_interval}
-    else:
-        interval = float(interval_input)
-        config['timeInterval'] = {'min': interval, 'max': interval}
+    interval_input = await ainput("⏱️  请输入间隔时间(秒) (可以输入范围/也可固定，如: 30-90/100): ")
+    config['timeInterval'] = parse_range(interval_input)
 
     print("\n✅ 配置完成!")
     return config
 
 
-def get_exchange_credentials(exchange: str, config: Dict) -> Dict:
-    """获取交易所凭证"""
-    credentials = {}
-    
-    if exchange == '1':  # MEXC
-        if not config.get('mexc', {}).get('api_key') or not config.get('mexc', {}).get('api_secret'):
-            raise ValueError('MEXC API 配置不完整')
-        credentials = {
-            'api_key': config['mexc']['api_key'],
-            'api_secret': config['mexc']['api_secret']
-        }
-    elif exchange == '2':  # Binance
-        if not config.get('binance', {}).get('api_key') or not config.get('binance', {}).get('api_secret'):
-            raise ValueError('Binance API 配置不完整')
-        credentials = {
-            'api_key': config['binance']['api_key'],
-            'api_secret': config['binance']['api_secret']
-        }
-    elif exchange == '3':  # OKX
-        if not config.get('okx', {}).get('api_key') or not config.get('okx', {}).get('api_secret') or not config.get('okx', {}).get('password'):
-            raise ValueError('OKX API 配置不完整')
-        credentials = {
-            'api_key': config['okx']['api_key'],
-            'api_secret': config['okx']['api_secret'],
-            'password': config['okx']['password']
-        }
-    elif exchange == '4':  # Bitget
-        if not config.get('bitget', {}).get('api_key') or not config.get('bitget', {}).get('api_secret') or not config.get('bitget', {}).get('password'):
-            raise ValueError('Bitget API 配置不完整')
-        credentials = {
-            'api_key': config['bitget']['api_key'],
-            'api_secret': config['bitget']['api_secret'],
-            'password': config['bitget']['password']
-        }
-    elif exchange == '5':  # Gate
-        if not config.get('gate', {}).get('api_key') or not config.get('gate', {}).get('api_secret'):
-            raise ValueError('Gate API 配置不完整')
-        credentials = {
-            'api_key': config['gate']['api_key'],
-            'api_secret': config['gate']['api_secret']
-        }
-    
-    return credentials
+def get_exchange_concurrency(exchange: str, config: Dict) -> int:
+    """获取交易所允许的最大并发提币数，默认逐笔提币"""
+    try:
+        return max(1, int(config.get(exchange, {}).get('concurrency', 1)))
+    except (TypeError, ValueError):
+        raise ValueError('concurrency 配置必须为正整数')
+
+def withdrawal_lookup(exchange_instance, withdraw_config: Dict):
+    """按自定义ID查询提币的函数，交易所不支持时返回 None"""
+    if not hasattr(exchange_instance, 'find_withdrawal'):
+        return None
+    return partial(exchange_instance.find_withdrawal, withdraw_config['coin'])
+
+async def check_plan(exchange_instance, plan: WithdrawPlan, withdraw_config: Dict, label: str = '') -> Dict:
+    """确认上次中断的提交后，流式读取整批计划进行预检"""
+    if plan.journal is not None:
+        await plan.journal.resolve_intents(withdrawal_lookup(exchange_instance, withdraw_config),
+                                           f"[{label}] " if label else '')
+    return await preflight_check(exchange_instance, plan, withdraw_config, label)
+
+async def process_withdrawals(exchange_instance, plan: WithdrawPlan, withdraw_config: Dict,
+                              concurrency: int = 1, label: str = '', checked: bool = False):
+    """通用提币处理流程，计划未预检时先整批预检，再边读取地址文件边提交"""
+    prefix = f"[{label}] " if label else ''
+    journal = plan.journal
+    # 各阶段耗时按交易所记录到指标中
+    exchange_name = getattr(exchange_instance, 'name', '') or label
+    stage = partial(metrics.timer, 'bbot_stage_seconds', exchange=exchange_name)
+    batch_started = time.perf_counter()
+    if not checked:
+        with stage(stage='preflight'):
+            await check_plan(exchange_instance, plan, withdraw_config, label)
 
-async def process_withdrawals(exchange_instance, addresses: List[Dict], withdraw_config: Dict):
-    """通用提币处理流程"""
-    total = len(addresses)
+    total = plan.count
     print(f"\n" + "─" * 40)
-    print(f"📋 总计待处理地址: {total}")
+    print(f"📋 {prefix}总计待处理地址: {total}")
+    print(f"🚦 {prefix}最大并发数: {concurrency}")
     print("─" * 40)
-    
-    for i, addr_info in enumerate(addresses, 1):
-        print(f"\n🔄 进度: {i}/{total}")
-        print(f"📬 提币地址: {addr_info['address']}")
-
-        # 计算提币金额
-        if isinstance(withdraw_config['amount'], dict):
-            amount = random.uniform(
-                withdraw_config['amount']['min'],
-                withdraw_config['amount']['max']
-            )
-        else:
-            amount = withdraw_config['amount']
 
-        # 执行提币
-        try:
-            print(f"💰 提币金额: {amount} {withdraw_config['coin']}")
-            result = await exchange_instance.withdraw(
-                coin=withdraw_config['coin'],
-                network=withdraw_config['network'],
-                address=addr_info['address'],
-                amount=str(amount),
-                memo=addr_info['memo'],
-                withdraw_order_id=addr_info['id'],
-                remark=addr_info['remark']
-            )
-            print(f"✅ 提币成功: {result}")
+    stats = {'success': 0, 'failed': 0}
+    started = time.monotonic()
+    tracker = WithdrawStatusTracker(exchange_instance, withdraw_config['coin'], label)
+    if journal is not None:
+        tracker.on_status = lambda record: journal.record('status', record['key'], id=record['id'],
+                                                          status=record['status'])
+
+    lookup = withdrawal_lookup(exchange_instance, withdraw_config)
+
+    def client_id_of(addr_info: Dict) -> str:
+        return journal.client_id(addr_info) if journal is not None else addr_info['id']
+
+    settings = getattr(exchange_instance, 'settings', {})
+    retry_options = {
+        'retries': int(settings.get('withdraw_retries', 3)),
+        'base_delay': float(settings.get('retry_base_delay', 1)),
+        'max_delay': float(settings.get('retry_max_delay', 30)),
+    }
+    # 提交超时后按自定义ID确认的时长(秒)：提币历史接口有延迟，刚受理的提币可能要过一段时间才能查到
+    lookup_window = float(settings.get('lookup_window', 30))
+    # 交易所拒绝重复的自定义ID时查询一次即可，查不到直接重试也不会重复提币
+    idempotent = getattr(exchange_instance, 'client_id_idempotent', False)
 
+    async def submit(job):
+        addr_info, amount = job
+        key = journal_key(addr_info)
+        client_id = client_id_of(addr_info)
+        # 网络错误后无法向交易所确认提交结果时置为 True，此时既不重试也不记为失败
+        unconfirmed = False
+
+        async def attempt():
+            nonlocal unconfirmed
+            submitted_at = int(time.time() * 1000)
+            try:
+                return await exchange_instance.withdraw(
+                    coin=withdraw_config['coin'],
+                    network=withdraw_config['network'],
+                    address=addr_info['address'],
+                    amount=plan.format_amount(amount),
+                    memo=addr_info['memo'],
+                    withdraw_order_id=client_id,
+                    remark=addr_info['remark']
+                )
+            except NetworkError as e:
+                # 超时等网络错误时提交结果不确定，按自定义ID确认交易所是否实际已受理，避免重复提币
+                if not client_id or lookup is None:
+                    unconfirmed = True
+                    raise
+                try:
+                    with stage(stage='lookup'):
+                        found = await poll_async(lookup, client_id, submitted_at - 60 * 1000,
+                                                 window=0 if idempotent else lookup_window)
+                except Exception:
+                    unconfirmed = True
+                    raise e
+                if found is None:
+                    # 确认时长内始终查不到才视为交易所没有受理；未设置确认时长时无法确认，留待续跑
+                    if not idempotent and lookup_window <= 0:
+                        unconfirmed = True
+                    raise
+                print(f"🔁 {prefix}{addr_info['address']} 提交报错但交易所已受理 (ID: {found['id']})")
+                return {'code': 0, 'msg': 'success', 'data': {'id': found['id'], 'withdrawal': found}}
+
+        def should_retry(error: Exception) -> bool:
+            # 限频说明请求未被受理；网络错误只有确认交易所没有该笔提币后才重试
+            return is_retryable(error) and (isinstance(error, RateLimitExceeded) or not unconfirmed)
+
+        def on_retry(attempt_no: int, error: Exception, delay: float):
+            print(f"⏳ {prefix}{addr_info['address']} 提币失败 ({type(error).__name__})，"
+                  f"{delay:.1f} 秒后第 {attempt_no} 次重试: {str(error)}")
+
+        # 提交前先落盘意图，中断后续跑时据此判断是否可能已提币
+        if journal is not None:
+            journal.record('intent', key, address=addr_info['address'], amount=amount, client_id=client_id)
+        try:
+            with stage(stage='submit'):
+                result = await retry_async(attempt, should_retry=should_retry, on_retry=on_retry, **retry_options)
         except Exception as e:
-            print(f"❌ 提币失败: {str(e)}")
-            continue
+            # 无法确认时保留意图记录，续跑时再次确认
+            if journal is not None and not unconfirmed:
+                journal.record('failed', key, error=str(e), error_type=type(e).__name__, client_id=client_id)
+            raise
+        if journal is not None:
+            journal.record('submitted', key, id=str(result['data']['id']), client_id=client_id)
+        return result
+
+    def on_result(i, job, result, error):
+        addr_info, amount = job
+        print(f"\n🔄 {prefix}进度: {i}/{total}")
+        print(f"📬 {prefix}提币地址: {addr_info['address']}")
+        print(f"💰 {prefix}提币金额: {plan.format_amount(amount)} {withdraw_config['coin']}")
+        if error is None:
+            stats['success'] += 1
+            print(f"✅ {prefix}提币成功: {result}")
+            tracker.track(result['data']['id'], i, addr_info['address'], client_id_of(addr_info),
+                          key=journal_key(addr_info))
+        else:
+            stats['failed'] += 1
+            print(f"❌ {prefix}提币失败 ({type(error).__name__}): {str(error)}")
+
+    dispatcher = WithdrawDispatcher(concurrency, withdraw_config['timeInterval'], label, exchange=exchange_name)
+    try:
+        await dispatcher.run(plan, submit, on_result)
+
+        # 提交全部完成后再等待后台跟踪的提币状态
+        status_timeout = float(settings.get('status_timeout', 300))
+        with stage(stage='status_wait'):
+            statuses = await tracker.drain(status_timeout)
+    finally:
+        # 提交出错时同样停止后台查询，调用方随后会关闭日志和交易所连接
+        await tracker.stop()
+    metrics.observe('bbot_stage_seconds', time.perf_counter() - batch_started, exchange=exchange_name, stage='batch')
+
+    print("\n" + "─" * 40)
+    print(f"📊 {prefix}完成: 成功 {stats['success']} / 失败 {stats['failed']}，用时 {time.monotonic() - started:.2f} 秒")
+    if statuses:
+        print(f"📦 {prefix}提币状态: " + ', '.join(f"{status} {count}" for status, count in statuses.items()))
+    print("─" * 40)
+    return stats
+
+def create_exchange(exchange: str, config: Dict):
+    """按交易所名称从注册表导入适配器并创建实例"""
+    adapter = load_adapter(exchange, config)
+    settings = config.get(exchange, {})
+    credentials = adapter.credentials_from_config(settings)
+
+    print(f'\n{adapter.display_name or exchange} - 开始提币流程')
+    if adapter.notice:
+        print(f'注意: {adapter.notice}')
+    return adapter(credentials, settings)
+
+def load_job_file(path: str, config: Dict) -> List[Dict]:
+    """加载 JSON 或 YAML 格式的任务文件"""
+    with open(path, 'r', encoding='utf-8') as file:
+        if path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise Exception('读取 YAML 任务文件需要安装 PyYAML: pip install pyyaml')
+            spec = yaml.safe_load(file)
+        else:
+            spec = json.load(file)
+    return parse_job_spec(spec or {}, config)
+
+def parse_job_spec(spec: Dict, config: Dict) -> List[Dict]:
+    """解析任务定义，任务中未填写的字段使用顶层的默认值"""
+    adapters = discover_adapters(config)
+    defaults = {key: value for key, value in spec.items() if key != 'jobs'}
+    jobs = []
+    for i, item in enumerate(spec.get('jobs', []), 1):
+        job = {**defaults, **item}
+        name = str(job.get('exchange', '')).lower()
+        if name not in adapters:
+            raise ValueError(f'任务 {i}: 不支持的交易所 {job.get("exchange")}')
+        for key in ('coin', 'network', 'amount', 'timeInterval'):
+            if key not in job:
+                raise ValueError(f'任务 {i}: 缺少字段 {key}')
+
+        amount = job['amount']
+        withdraw_config = {
+            'coin': str(job['coin']).upper(),
+            'network': job['network'],
+            'amount': amount if isinstance(amount, (int, float)) and not isinstance(amount, bool)
+                      else parse_range(amount),
+            'timeInterval': parse_range(job['timeInterval']),
+        }
+        if job.get('total') is not None:
+            withdraw_config['total'] = float(job['total'])
+        jobs.append({
+            'exchange': name,
+            'name': name,
+            'addresses': job.get('addresses', 'add.csv'),
+            'rows': job.get('rows'),
+            'withdraw_config': withdraw_config,
+        })
+    if not jobs:
+        raise ValueError('任务文件中没有任务')
+    return jobs
+
+async def prepare_job(job: Dict, config: Dict, resume: bool = False) -> Dict:
+    """创建交易所实例并生成、预检提币计划，rows 为 [起始行, 结束行]（从1开始，含两端）"""
+    check_address_file(job['addresses'])
+    journal = WithdrawJournal(make_batch_id(job['name'], job['withdraw_config'], job['addresses'], job['rows']),
+                              resume=resume)
+    plan = WithdrawPlan(job['addresses'], job['withdraw_config'], job['rows'], journal, job['name'])
+    exchange_instance = create_exchange(job['exchange'], config)
+    try:
+        await exchange_instance.check_connection()
+        await check_plan(exchange_instance, plan, job['withdraw_config'], job['name'])
+    except Exception:
+        await exchange_instance.close()
+        journal.close()
+        raise
+    return {**job, 'instance': exchange_instance, 'plan': plan, 'journal': journal}
+
+async def run_job(job: Dict, config: Dict) -> Dict:
+    """执行单个已预检的交易所任务"""
+    try:
+        return await process_withdrawals(job['instance'], job['plan'], job['withdraw_config'],
+                                         get_exchange_concurrency(job['exchange'], config),
+                                         label=job['name'], checked=True)
+    finally:
+        job['journal'].close()
+        await job['instance'].close()
+
+async def process_job_file(path: str, config: Dict, resume: bool = False) -> List:
+    """执行任务文件中的所有任务"""
+    return await run_jobs(load_job_file(path, config), config, resume)
+
+async def run_jobs(jobs: List[Dict], config: Dict, resume: bool = False) -> List:
+    """多交易所并行提币，各交易所在同一事件循环中同时执行各自的队列，返回各任务的统计或异常"""
+    print(f"\n📂 共 {len(jobs)} 个任务: {', '.join(job['name'] for job in jobs)}")
+
+    # 所有任务都预检通过后才开始提币
+    prepared = await asyncio.gather(*(prepare_job(job, config, resume) for job in jobs), return_exceptions=True)
+    failures = [(job, result) for job, result in zip(jobs, prepared) if isinstance(result, Exception)]
+    if failures:
+        for job in prepared:
+            if not isinstance(job, Exception):
+                job['journal'].close()
+                await job['instance'].close()
+        for job, error in failures:
+            print(f"\n❌ [{job['name']}] {str(error)}")
+        raise Exception('任务预检未通过，所有交易所均未提交提币')
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(run_job(job, config) for job in prepared), return_exceptions=True)
+
+    print("\n" + "=" * 40)
+    for job, result in zip(jobs, results):
+        if isinstance(result, Exception):
+            print(f"❌ [{job['name']}] 任务失败: {str(result)}")
+        else:
+            print(f"✅ [{job['name']}] 成功 {result['success']} / 失败 {result['failed']}")
+    print(f"⏱️  总用时 {time.monotonic() - started:.2f} 秒")
+    print("=" * 40)
+    return results
+
+def menu_line(text: str, width: int = 32) -> str:
+    """菜单中的一行，按显示宽度补齐（中文占两格）"""
+    display_width = sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text)
+    return "│  " + text + " " * max(0, width - 2 - display_width) + "│"
+
+def export_metrics(path: str = None):
+    """批次结束后把各阶段和各接口的耗时摘要写入 JSON 文件"""
+    if not path:
+        return
+    try:
+        metrics.write_json(path)
+        print(f"📈 耗时指标已写入 {path}")
+    except Exception as e:
+        print(f"⚠️ 写入耗时指标失败: {str(e)}")
+
+async def select_exchange(resume: bool = False, metrics_json: str = None) -> bool:
+    """选择交易所，resume 为 True 时跳过日志中已完成的地址，指定 metrics_json 时每批结束后写入耗时指标"""
+    config = load_config()
+    # 菜单按注册表生成，最后一项为多交易所并行
+    adapters = discover_adapters(config)
+    options = {str(i): name for i, name in enumerate(adapters, 1)}
+    multi_option = str(len(options) + 1)
 
-        # 如果不是最后一个地址，则等待
-        if i < len(addresses):
-            wait_time = random.uniform(
-                withdraw_config['timeInterval']['min'],
-                withdraw_config['timeInterval']['max']
-            )
-            print(f"⏳ 等待 {wait_time:.2f} 秒后继续...")
-            await asyncio.sleep(wait_time)
-
-async def select_exchange() -> bool:
-    """选择交易所"""
     print("\n" + "=" * 34)
     print("           Bbot提币工具")
     print("=" * 34)
     print("\n请选择要使用的交易所:")
     print("┌────────────────────────────────┐")
-    print("│  1. MEXC    - 抹茶             │")
-    print("│  2. Binance - 币安             │")
-    print("│  3. OKX     - 欧易             │")
-    print("│  4. Bitget  - 比特             │")
-    print("│  5. Gate    - 芝麻             │")
-    print("│  0. Exit    - 退出程序         │")
+    for option, name in options.items():
+        print(menu_line(f"{option}. {adapters[name]['label']}"))
+    print(menu_line(f"{multi_option}. Multi   - 多交易所并行"))
+    print(menu_line("0. Exit    - 退出程序"))
     print("└────────────────────────────────┘")
 
     answer = input('请输入选项数字: ')
@@ -219,46 +423,40 @@ async def select_exchange() -> bool:
         return False
 
     try:
-        # 加载配置
-        addresses = load_addresses()
-        config = load_config()
-        credentials = get_exchange_credentials(answer, config)
-
-        # 根据选择创建相应的交易所实例并执行提币
-        if answer == '1':
-            print('\n【MEXC】抹茶交易所 - 开始提币流程')
-            mexc = MexcWithdraw(credentials)
-            withdraw_config = await get_withdraw_config(mexc)
-            await process_withdrawals(mexc, addresses, withdraw_config)
-        
-        elif answer == '2':
-            print('\n【Binance】币安交易所 - 开始提币流程')
-            binance = BinanceWithdraw(credentials)
-            withdraw_config = await get_withdraw_config(binance)
-            await process_withdrawals(binance, addresses, withdraw_config)
-        
-        elif answer == '3':
-            print('\n【OKX】欧易交易所 - 开始提币流程')
-            print('注意: 请确保已添加提币地址白名单')
-            okx = OkxWithdraw(credentials)
-            withdraw_config = await get_withdraw_config(okx)
-            await process_withdrawals(okx, addresses, withdraw_config)
-        
-        elif answer == '4':
-            print('\n【Bitget】比特交易所 - 开始提币流程')
-            bitget = BitgetWithdraw(credentials)
-            withdraw_config = await get_withdraw_config(bitget)
-            await process_withdrawals(bitget, addresses, withdraw_config)
-        
-        elif answer == '5':
-            print('\n【Gate】芝麻交易所 - 开始提币流程')
-            gate = GateWithdraw(credentials)
-            withdraw_config = await get_withdraw_config(gate)
-            await process_withdrawals(gate, addresses, withdraw_config)
-        
-        else:
+        if answer == multi_option:
+            path = input('请输入任务文件路径 (默认 jobs.json): ').strip() or 'jobs.json'
+            try:
+                await process_job_file(path, config, resume)
+            finally:
+                export_metrics(metrics_json)
+            return True
+
+        if answer not in options:
             print('\n❌ 无效选项，请重新选择')
             return True
+        exchange = options[answer]
+
+        # 地址文件只检查表头，提币时再逐行读取
+        check_address_file('add.csv')
+
+        # 根据选择创建相应的交易所实例
+        exchange_instance = create_exchange(exchange, config)
+
+        # 执行提币，结束后释放交易所连接
+        try:
+            await exchange_instance.check_connection()
+            withdraw_config = await get_withdraw_config(exchange_instance)
+            journal = WithdrawJournal(make_batch_id(exchange, withdraw_config, 'add.csv'),
+                                      resume=resume)
+            try:
+                plan = WithdrawPlan('add.csv', withdraw_config, journal=journal)
+                await process_withdrawals(exchange_instance, plan, withdraw_config,
+                                          get_exchange_concurrency(exchange, config))
+            finally:
+                journal.close()
+        finally:
+            await exchange_instance.close()
+            export_metrics(metrics_json)
 
     except Exception as e:
         print(f'\n❌ 操作失败: {str(e)}')
@@ -323,7 +521,146 @@ def print_startup_info():
     
     input("\n按回车键继续...")
 
-async def main():
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='Bbot - 多链批量提币机器人')
+    parser.add_argument('--resume', action='store_true',
+                        help='续跑上次中断的批次，跳过提币日志中已完成的地址')
+    headless = parser.add_argument_group('无交互模式', '指定 --job 或 --exchange 时不显示菜单，直接执行后退出')
+    headless.add_argument('--job', help='任务文件 (JSON/YAML)，格式同多交易所任务文件')
+    headless.add_argument('--exchange', help='交易所名称，如 binance')
+    headless.add_argument('--coin', help='币种，如 USDT')
+    headless.add_argument('--network', help='网络名称，与交互模式中显示的一致')
+    headless.add_argument('--amount', help='提币数量，固定值或范围，如 5 或 1-10')
+    headless.add_argument('--total', type=float, help='合计金额，与范围金额一起使用，各笔之和等于该值')
+    headless.add_argument('--interval', default='0', help='间隔时间(秒)，固定值或范围，默认 0')
+    headless.add_argument('--addresses', default='add.csv', help='地址文件，默认 add.csv')
+    headless.add_argument('--rows', help='使用地址文件中的行范围，如 1-100')
+    routing = parser.add_argument_group('多交易所线路规划',
+                                        '指定 --route 时按手续费和限频把地址分配到多个交易所，生成地址文件和任务文件后退出')
+    routing.add_argument('--route', action='store_true', help='规划线路，需同时指定 --coin、--network 和 --amount')
+    routing.add_argument('--exchanges', help='参与规划的交易所，逗号分隔，默认 config.json 中已配置API的全部交易所')
+    routing.add_argument('--time-value', type=float, default=0.0,
+                         help='每节省1秒愿意多付的手续费(币本位)，默认 0 即只按手续费最低分配')
+    routing.add_argument('--route-dir', default='routes', help='规划结果的输出目录，默认 routes')
+    monitoring = parser.add_argument_group('耗时指标')
+    monitoring.add_argument('--metrics-port', type=int,
+                            help='在该端口提供 Prometheus 抓取接口 /metrics')
+    monitoring.add_argument('--metrics-host', default='127.0.0.1',
+                            help='抓取接口监听的地址，默认仅本机，需远程抓取时设为 0.0.0.0')
+    monitoring.add_argument('--metrics-json', help='每批提币结束后把各阶段耗时摘要写入该 JSON 文件')
+    args = parser.parse_args()
+    if args.job and args.exchange:
+        parser.error('--job 与 --exchange 不能同时使用')
+    if args.route and (args.job or args.exchange):
+        parser.error('--route 不能与 --job 或 --exchange 同时使用')
+    if args.route and not (args.coin and args.network and args.amount):
+        parser.error('--route 需要同时指定 --coin、--network 和 --amount')
+    if args.exchange and not (args.coin and args.network and args.amount):
+        parser.error('--exchange 需要同时指定 --coin、--network 和 --amount')
+    return args
+
+def job_spec_from_args(args) -> Dict:
+    """把命令行参数转换为只有一个任务的任务定义"""
+    job = {
+        'exchange': args.exchange,
+        'coin': args.coin,
+        'network': args.network,
+        'amount': args.amount,
+        'timeInterval': args.interval,
+        'addresses': args.addresses,
+    }
+    if args.rows:
+        job['rows'] = [int(row) for row in args.rows.split('-')]
+    if args.total is not None:
+        job['total'] = args.total
+    return {'jobs': [job]}
+
+async def run_headless(args) -> int:
+    """无交互执行任务，全部提币成功返回0，否则返回1"""
+    try:
+        config = load_config()
+        jobs = load_job_file(args.job, config) if args.job else parse_job_spec(job_spec_from_args(args), config)
+        results = await run_jobs(jobs, config, args.resume)
+    except Exception as e:
+        print(f'\n❌ 执行失败: {str(e)}')
+        return 1
+    finally:
+        export_metrics(args.metrics_json)
+    return 0 if all(not isinstance(result, Exception) and not result['failed'] for result in results) else 1
+
+def configured_exchanges(config: Dict) -> List[str]:
+    """config.json 中已填写完整API凭证的交易所"""
+    names = []
+    for name in discover_adapters(config):
+        try:
+            load_adapter(name, config).credentials_from_config(config.get(name, {}))
+        except ValueError:
+            continue
+        names.append(name)
+    return names
+
+async def load_route(name: str, config: Dict, coin: str, chain: str, interval: Dict):
+    """创建交易所实例读取线路信息后关闭"""
+    adapter = load_adapter(name, config)
+    settings = config.get(name, {})
+    exchange_instance = adapter(adapter.credentials_from_config(settings), settings)
+    try:
+        return await collect_route(name, exchange_instance, coin, chain, interval)
+    finally:
+        await exchange_instance.close()
+
+async def run_route(args) -> int:
+    """按手续费和限频把地址分配到多个交易所，生成各交易所的地址文件和任务文件，成功返回0"""
+    try:
+        config = load_config()
+        coin = args.coin.upper()
+        chain = canonical_chain(args.network)
+        if chain is None:
+            raise Exception(f'无法识别的网络: {args.network}')
+        names = ([name.strip().lower() for name in args.exchanges.split(',') if name.strip()]
+                 if args.exchanges else configured_exchanges(config))
+        if not names:
+            raise Exception('没有已配置API的交易所')
+
+        interval = parse_range(args.interval)
+        results = await asyncio.gather(*(load_route(name, config, coin, chain, interval) for name in names),
+                                       return_exceptions=True)
+        routes = []
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ [{name}] 读取手续费失败，不参与规划: {str(result)}")
+            elif result is None:
+                print(f"⚠️ [{name}] 不支持 {coin} 的 {chain} 网络")
+            else:
+                routes.append(result)
+
+        planner = RoutePlanner(routes, parse_range(args.amount), args.time_value)
+        if not planner.routes:
+            raise Exception(f'没有交易所支持 {coin} 的 {chain} 网络且最小提币量不高于提币数量')
+        rows = [int(row) for row in args.rows.split('-')] if args.rows else None
+        addresses = iter_addresses(args.addresses, rows, reject_path_for(args.addresses, rows))
+        job_path = write_route_plan(planner, addresses, args.route_dir,
+                                    {'coin': coin, 'amount': args.amount, 'timeInterval': args.interval})
+    except Exception as e:
+        print(f'\n❌ 规划失败: {str(e)}')
+        return 1
+
+    summary = planner.summary()
+    print("\n" + "─" * 40)
+    print(f"🧭 {coin} {chain} 线路规划")
+    for item in summary:
+        print(f"📦 {item['exchange']:<8} {item['network']:<12} {item['count']:>6} 笔  "
+              f"手续费 {item['fee']:g} × {item['count']} = {item['fee_total']:g} {coin}  预计提交 {item['seconds']:.0f} 秒")
+    print(f"💰 手续费合计: {sum(item['fee_total'] for item in summary):g} {coin}")
+    print(f"⏱️  预计提交用时: {planner.makespan:.0f} 秒 (各交易所并行)")
+    if planner.unrouted:
+        print(f"⚠️ {planner.unrouted} 个地址因余额不足未分配，已写入 {os.path.join(args.route_dir, 'unrouted.csv')}")
+    print("─" * 40)
+    print(f"✅ 任务文件已生成，确认后执行: python main.py --job {job_path}")
+    return 0
+
+async def main(args):
     """主函数"""
     try:
         # 添加启动界面
@@ -331,9 +668,17 @@ async def main():
         
         continue_running = True
         while continue_running:
-            continue_running = await select_exchange()
+            continue_running = await select_exchange(args.resume, args.metrics_json)
     except Exception as e:
         print(f'程序执行错误: {str(e)}')
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_args()
+    if args.metrics_port:
+        metrics.serve(args.metrics_port, args.metrics_host)
+        print(f"📈 Prometheus 指标: http://{args.metrics_host}:{args.metrics_port}/metrics")
+    if args.route:
+        sys.exit(asyncio.run(run_route(args)))
+    if args.job or args.exchange:
+        sys.exit(asyncio.run(run_headless(args)))
+    asyncio.run(main(args))
\ No newline at end of file